@@ -0,0 +1,138 @@
+"""
+Caesar auto-cracker based on a single letter histogram of the ciphertext.
+
+The histogram is built once (streamed in chunks for large inputs) and the
+chi-squared statistic against English letter frequencies is computed for all
+25 keys in one NumPy operation. The batch API builds the histograms of many
+short messages with one bincount and scores them together.
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from task1 import ALPHABET
+
+# English letter frequencies in %, same reference table as in Lab_2
+ENGLISH_PERCENT = {
+    "E": 12.70, "T": 9.06, "A": 8.17, "O": 7.51, "I": 6.97, "N": 6.75,
+    "S": 6.33, "H": 6.09, "R": 5.99, "D": 4.25, "L": 4.03, "C": 2.78,
+    "U": 2.76, "M": 2.41, "W": 2.36, "F": 2.23, "G": 2.02, "Y": 1.97,
+    "P": 1.93, "B": 1.29, "V": 0.98, "K": 0.77, "J": 0.15, "X": 0.15,
+    "Q": 0.10, "Z": 0.07,
+}
+ENGLISH_FREQ = np.array([ENGLISH_PERCENT[ch] for ch in ALPHABET])
+ENGLISH_FREQ /= ENGLISH_FREQ.sum()
+
+KEYS = np.arange(1, 26)
+# SHIFT_INDEX[k - 1, x] is the ciphertext letter that decrypts to x under key k
+SHIFT_INDEX = (np.arange(26)[None, :] + KEYS[:, None]) % 26
+
+# Byte value -> letter number (0..25), 26 for everything that is not a letter
+BYTE_TO_LETTER = np.full(256, 26, dtype=np.intp)
+for _i, _ch in enumerate(ALPHABET):
+    BYTE_TO_LETTER[ord(_ch)] = _i
+    BYTE_TO_LETTER[ord(_ch.lower())] = _i
+
+DEFAULT_CHUNK_SIZE = 1 << 24  # 16 MiB per read
+
+
+def _as_bytes(data) -> bytes:
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+def letter_histogram(data) -> np.ndarray:
+    """Count letters A–Z (case-insensitive) in a str or bytes-like buffer."""
+    counts = np.bincount(np.frombuffer(_as_bytes(data), dtype=np.uint8),
+                         minlength=256)
+    return counts[65:91] + counts[97:123]
+
+
+def histogram_stream(src, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """Accumulate the letter histogram of a binary stream chunk by chunk."""
+    hist = np.zeros(26, dtype=np.int64)
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            return hist
+        hist += letter_histogram(chunk)
+
+
+def histogram_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """Letter histogram of a file of any size."""
+    with open(path, "rb") as f:
+        return histogram_stream(f, chunk_size)
+
+
+def chi_squared_scores(hist: np.ndarray) -> np.ndarray:
+    """
+    Chi-squared score of every key 1..25 (lower is better).
+    hist has shape (26,) or (M, 26); the result has shape (25,) or (M, 25).
+    """
+    hist = np.asarray(hist, dtype=np.float64)
+    total = np.maximum(hist.sum(axis=-1, keepdims=True), 1.0)
+    expected = total[..., None, :] * ENGLISH_FREQ      # (..., 1, 26)
+    observed = hist[..., SHIFT_INDEX]                   # (..., 25, 26)
+    return ((observed - expected) ** 2 / expected).sum(axis=-1)
+
+
+def rank_keys(hist: np.ndarray) -> list[tuple[int, float]]:
+    """All 25 keys as (key, score) pairs, best first."""
+    scores = chi_squared_scores(hist)
+    order = np.argsort(scores, kind="stable")
+    return [(int(KEYS[i]), float(scores[i])) for i in order]
+
+
+def crack(ciphertext) -> list[tuple[int, float]]:
+    """Rank the keys of an in-memory ciphertext (str or bytes)."""
+    return rank_keys(letter_histogram(ciphertext))
+
+
+def crack_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[tuple[int, float]]:
+    """Rank the keys of a ciphertext file, streaming it in chunks."""
+    return rank_keys(histogram_file(path, chunk_size))
+
+
+def batch_histograms(messages) -> np.ndarray:
+    """Letter histograms of many messages as an (M, 26) array, one bincount."""
+    encoded = [_as_bytes(m) for m in messages]
+    lengths = np.fromiter((len(m) for m in encoded), dtype=np.intp,
+                          count=len(encoded))
+    letters = BYTE_TO_LETTER[np.frombuffer(b"".join(encoded), dtype=np.uint8)]
+    owner = np.repeat(np.arange(len(encoded)), lengths)
+    is_letter = letters < 26
+    flat = owner[is_letter] * 26 + letters[is_letter]
+    return np.bincount(flat, minlength=len(encoded) * 26).reshape(-1, 26)
+
+
+def crack_many(messages) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Crack a batch of messages in one call.
+    Returns (keys, scores): the best key of every message and the full
+    (M, 25) score matrix for callers that want the runners-up.
+    """
+    scores = chi_squared_scores(batch_histograms(messages))
+    return KEYS[np.argmin(scores, axis=1)], scores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Recover the key of a Caesar ciphertext by frequency analysis.")
+    parser.add_argument("-i", "--input", help="ciphertext file (default: stdin)")
+    parser.add_argument("--top", type=int, default=5,
+                        help="number of candidate keys to show (default: 5)")
+    args = parser.parse_args(argv)
+
+    if args.input:
+        ranking = crack_file(args.input)
+    else:
+        ranking = rank_keys(histogram_stream(sys.stdin.buffer))
+
+    print("Key  Chi-squared")
+    for key, score in ranking[:args.top]:
+        print(f"{key:>3}  {score:.2f}")
+
+
+if __name__ == "__main__":
+    main()
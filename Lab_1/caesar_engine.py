@@ -0,0 +1,166 @@
+"""
+Translation-table Caesar engine with a non-interactive streaming file mode.
+
+All 26 shift tables are built once at import time, so encryption of a whole
+buffer is a single str.translate / bytes.translate call instead of a Python
+loop over L2N/N2L.
+
+Two modes are supported:
+- strict (default): the task1 rules - only letters A-Z/a-z and spaces are
+  accepted, text is upper-cased and spaces are removed;
+- passthrough: letters are shifted (case is kept), everything else is copied
+  unchanged, which is what you want for log files and other free text.
+"""
+
+import argparse
+import sys
+
+from task1 import ALPHABET, validate_text, normalize_text
+
+UPPER = "".join(ALPHABET)
+LOWER = UPPER.lower()
+UPPER_B = UPPER.encode("ascii")
+LOWER_B = LOWER.encode("ascii")
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB per read
+STRICT_DROPPED_BYTES = b" \r\n"  # removed by strict streaming, like spaces in normalize_text
+
+
+def _rotate(letters, key):
+    """Alphabet rotated left by key positions (position x holds x + key)."""
+    return letters[key:] + letters[:key]
+
+
+# Strict tables fold lowercase into the shifted uppercase letters and delete
+# spaces (normalize_text), passthrough tables keep the case of every letter.
+STRICT_TABLES = [str.maketrans(UPPER + LOWER, _rotate(UPPER, k) * 2, " ")
+                 for k in range(26)]
+PASSTHROUGH_TABLES = [str.maketrans(UPPER + LOWER,
+                                    _rotate(UPPER, k) + _rotate(LOWER, k))
+                      for k in range(26)]
+STRICT_BYTE_TABLES = [bytes.maketrans(UPPER_B + LOWER_B, _rotate(UPPER_B, k) * 2)
+                      for k in range(26)]
+PASSTHROUGH_BYTE_TABLES = [bytes.maketrans(UPPER_B + LOWER_B,
+                                           _rotate(UPPER_B, k) + _rotate(LOWER_B, k))
+                           for k in range(26)]
+
+
+def _shift(key: int, decrypt: bool) -> int:
+    """Effective encryption shift (decryption is encryption with 26 - key)."""
+    return (-key if decrypt else key) % 26
+
+
+def caesar_translate(text: str, key: int, decrypt: bool = False,
+                     strict: bool = True) -> str:
+    """
+    Encrypt (or decrypt) a whole string with one translate call.
+    In strict mode invalid input raises ValueError, like the task1 checks.
+    """
+    shift = _shift(key, decrypt)
+    if not strict:
+        return text.translate(PASSTHROUGH_TABLES[shift])
+
+    result = text.translate(STRICT_TABLES[shift])
+    # After translation a valid text is made of ASCII uppercase letters only
+    if result.isascii() and (result.isalpha() or not result):
+        return result
+    # Rare letters such as 'ı' pass validate_text and upper-case into A-Z
+    if not validate_text(text):
+        raise ValueError("Text must contain only letters A–Z/a–z and spaces.")
+    return normalize_text(text).translate(STRICT_TABLES[shift])
+
+
+def caesar_translate_bytes(data: bytes, key: int, decrypt: bool = False,
+                           strict: bool = True) -> bytes:
+    """
+    Byte-oriented variant used by the streaming mode.
+    Only ASCII letters count as letters; other bytes (including UTF-8
+    sequences) are copied in passthrough mode and rejected in strict mode.
+    Strict mode drops line terminators like spaces, so text files with
+    line breaks (and the usual final newline) are accepted.
+    """
+    shift = _shift(key, decrypt)
+    if not strict:
+        return data.translate(PASSTHROUGH_BYTE_TABLES[shift])
+
+    result = data.translate(STRICT_BYTE_TABLES[shift], STRICT_DROPPED_BYTES)
+    if result and not result.isalpha():
+        raise ValueError(
+            f"Invalid byte at offset {_first_invalid(data)}: "
+            "only letters A–Z/a–z, spaces and line breaks are allowed.")
+    return result
+
+
+def _first_invalid(data: bytes) -> int:
+    """Offset of the first byte that is not an ASCII letter, a space or a line break."""
+    for i, b in enumerate(data):
+        if b not in STRICT_DROPPED_BYTES and not (0x41 <= b <= 0x5A or 0x61 <= b <= 0x7A):
+            return i
+    return -1
+
+
+def caesar_stream(src, dst, key: int, decrypt: bool = False, strict: bool = True,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Copy a binary stream to another through the cipher in fixed-size chunks.
+    Memory use is bounded by chunk_size whatever the input size.
+    Returns the number of bytes read.
+    """
+    total = 0
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            return total
+        try:
+            dst.write(caesar_translate_bytes(chunk, key, decrypt, strict))
+        except ValueError:
+            raise ValueError(
+                f"Invalid byte at offset {total + _first_invalid(chunk)}: "
+                "only letters A–Z/a–z, spaces and line breaks are allowed.") from None
+        total += len(chunk)
+
+
+def caesar_file(input_path: str, output_path: str, key: int, decrypt: bool = False,
+                strict: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Encrypt or decrypt input_path into output_path in streaming mode."""
+    with open(input_path, "rb") as src, open(output_path, "wb") as dst:
+        return caesar_stream(src, dst, key, decrypt, strict, chunk_size)
+
+
+def parse_key(s: str) -> int:
+    """argparse type for the Caesar key (1–25)."""
+    if s.isdigit() and 1 <= int(s) <= 25:
+        return int(s)
+    raise argparse.ArgumentTypeError("key must be an integer between 1 and 25")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Non-interactive Caesar cipher over files or stdin/stdout.")
+    parser.add_argument("operation", choices=("encrypt", "decrypt"))
+    parser.add_argument("key", type=parse_key, help="shift key (1–25)")
+    parser.add_argument("-i", "--input", help="input file (default: stdin)")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--passthrough", action="store_true",
+                        help="keep non-letters and letter case instead of "
+                             "validating and normalizing the text")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="bytes per read (default: 1 MiB)")
+    args = parser.parse_args(argv)
+
+    src = open(args.input, "rb") if args.input else sys.stdin.buffer
+    dst = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        caesar_stream(src, dst, args.key, args.operation == "decrypt",
+                      not args.passthrough, args.chunk_size)
+    except ValueError as e:
+        parser.exit(1, f"Error: {e}\n")
+    finally:
+        if args.input:
+            src.close()
+        if args.output:
+            dst.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Ciphertext-only attack on the Task 2 cipher (permuted alphabet + shift k1).
+
+Encryption moves the letter at position x of the permuted alphabet to the
+letter at position x + k1, so the cipher is a monoalphabetic substitution
+whose cycle structure depends only on gcd(k1, 26). Keys with the same gcd
+cannot be told apart from the ciphertext: for any such k1' there is a
+permutation that gives exactly the same substitution. The solver therefore
+works with one representative k1 per class (1, 2 and 13) and can
+re-express the result for any other k1 of the class.
+
+Every restart first hill-climbs over unrestricted substitutions, then
+projects the result onto each k1 class and finishes the climb over the
+permuted alphabet itself, so the returned key is a valid Task 2 key.
+
+Scoring uses English quadgram log-probabilities built from a training
+corpus (any large English text). The ciphertext is reduced to its distinct
+quadgrams with counts, and a swap in the permutation is scored by
+re-evaluating only the quadgrams that contain a letter whose mapping changed.
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import combinations
+
+import numpy as np
+
+from task1 import ALPHABET
+from task2 import caesar2_decrypt, get_cipher
+from caesar_cracker import BYTE_TO_LETTER
+
+REPRESENTATIVE_K1 = (1, 2, 13)       # one k1 per gcd(k1, 26) class
+QUAD_WEIGHTS = np.array([26 ** 3, 26 ** 2, 26, 1])
+SWAPS = np.array(list(combinations(range(26), 2)))
+DEFAULT_CHUNK_SIZE = 1 << 24
+
+
+def to_letters(data) -> np.ndarray:
+    """Letter numbers (0..25) of a str or bytes buffer, non-letters dropped."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    letters = BYTE_TO_LETTER[np.frombuffer(data, dtype=np.uint8)]
+    return letters[letters < 26]
+
+
+def load_quadgrams(corpus_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Build the quadgram log10-probability table (26**4 entries) from a corpus.
+    Returns (table, reference) where reference is the mean quadgram score of
+    the corpus itself, i.e. what a correct decryption should look like.
+    """
+    counts = np.zeros(26 ** 4, dtype=np.int64)
+    tail = np.empty(0, dtype=np.intp)
+    with open(corpus_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            seq = np.concatenate((tail, to_letters(chunk)))
+            if len(seq) >= 4:
+                quads = np.lib.stride_tricks.sliding_window_view(seq, 4) @ QUAD_WEIGHTS
+                counts += np.bincount(quads, minlength=26 ** 4)
+            tail = seq[-3:]
+
+    total = counts.sum()
+    if total == 0:
+        raise ValueError(f"Corpus '{corpus_path}' contains no quadgrams.")
+    table = np.full(26 ** 4, math.log10(0.01 / total))
+    seen = counts > 0
+    table[seen] = np.log10(counts[seen] / total)
+    reference = float(counts @ table / total)
+    return table, reference
+
+
+class CiphertextQuadgrams:
+    """Distinct ciphertext quadgrams with counts, indexed by the letters they contain."""
+
+    def __init__(self, ciphertext):
+        letters = to_letters(ciphertext)
+        if len(letters) < 4:
+            raise ValueError("Ciphertext must contain at least 4 letters.")
+        windows = np.lib.stride_tricks.sliding_window_view(letters, 4)
+        codes, counts = np.unique(windows @ QUAD_WEIGHTS, return_counts=True)
+        self.quads = np.stack([codes // w % 26 for w in QUAD_WEIGHTS], axis=1)
+        self.counts = counts.astype(np.float64)
+        self.total = len(windows)
+        self.touching = [np.flatnonzero((self.quads == y).any(axis=1))
+                         for y in range(26)]
+
+    def index(self, decrypt_map: np.ndarray, rows=slice(None)) -> np.ndarray:
+        """Plaintext quadgram codes of the selected distinct quadgrams."""
+        return decrypt_map[self.quads[rows]] @ QUAD_WEIGHTS
+
+
+def decrypt_map(perm: np.ndarray, k1: int) -> np.ndarray:
+    """Cipher letter -> plain letter for a permutation (perm[pos] = letter)."""
+    dmap = np.empty(26, dtype=np.intp)
+    dmap[perm] = np.roll(perm, k1)
+    return dmap
+
+
+def perm_for_k1(perm, k1: int, target_k1: int):
+    """
+    Permutation that gives the same cipher as (k1, perm) under target_k1,
+    or None when gcd(target_k1, 26) differs and no such permutation exists.
+    """
+    if math.gcd(k1, 26) != math.gcd(target_k1, 26):
+        return None
+    perm = list(perm)
+    encrypt = {perm[p]: perm[(p + k1) % 26] for p in range(26)}
+    result = [None] * 26
+    seen = set()
+    cycle_len = 26 // math.gcd(target_k1, 26)
+    for start in range(math.gcd(target_k1, 26)):
+        letter = next(ch for ch in perm if ch not in seen)
+        for t in range(cycle_len):
+            result[(start + t * target_k1) % 26] = letter
+            seen.add(letter)
+            letter = encrypt[letter]
+    return result
+
+
+# Worker state, set once per process by _init_worker
+_table = None
+_stats = None
+_stop = None
+
+
+def _init_worker(table, ciphertext, stop=None):
+    global _table, _stats, _stop
+    _table = table
+    _stats = CiphertextQuadgrams(ciphertext)
+    _stop = stop
+
+
+def _stopped() -> bool:
+    """True once another restart has reached the confidence threshold."""
+    return _stop is not None and _stop.is_set()
+
+
+def project(dmap: np.ndarray, k1: int) -> np.ndarray:
+    """
+    Permutation for k1 whose cipher is as close as possible to dmap: cycles
+    of the encryption map are laid out along the position cycles of the
+    shift, so only the junctions between cycles can disagree with dmap.
+    """
+    encrypt = np.argsort(dmap)
+    perm = np.empty(26, dtype=np.intp)
+    placed = np.zeros(26, dtype=bool)
+    g = math.gcd(k1, 26)
+    positions = [(s + t * k1) % 26 for s in range(g) for t in range(26 // g)]
+    letter = 0
+    for pos in positions:
+        if placed[letter]:
+            letter = int(np.flatnonzero(~placed)[0])
+        perm[pos] = letter
+        placed[letter] = True
+        letter = encrypt[letter]
+    return perm
+
+
+def _try(new_map, dmap, idx, changed):
+    """Score change of replacing dmap with new_map, only over affected quadgrams."""
+    rows = np.unique(np.concatenate([_stats.touching[y] for y in changed]))
+    new_idx = _stats.index(new_map, rows)
+    delta = float(_stats.counts[rows] @ (_table[new_idx] - _table[idx[rows]]))
+    return delta, rows, new_idx
+
+
+def _climb_substitution(rng) -> np.ndarray:
+    """Hill-climb over unrestricted substitutions (swap two plaintext letters)."""
+    dmap = rng.permutation(26)
+    idx = _stats.index(dmap)
+    improved = True
+    while improved and not _stopped():
+        improved = False
+        for a, b in SWAPS[rng.permutation(len(SWAPS))]:
+            new_map = dmap.copy()
+            new_map[a], new_map[b] = dmap[b], dmap[a]
+            delta, rows, new_idx = _try(new_map, dmap, idx, (a, b))
+            if delta > 1e-9:
+                idx[rows] = new_idx
+                dmap = new_map
+                improved = True
+    return dmap
+
+
+def _climb_keyed(perm: np.ndarray, k1: int, rng):
+    """Hill-climb over the permuted alphabet for a fixed k1 (swap two positions)."""
+    dmap = decrypt_map(perm, k1)
+    idx = _stats.index(dmap)
+    score = float(_stats.counts @ _table[idx])
+    improved = True
+    while improved and not _stopped():
+        improved = False
+        for a, b in SWAPS[rng.permutation(len(SWAPS))]:
+            perm[a], perm[b] = perm[b], perm[a]
+            new_map = decrypt_map(perm, k1)
+            changed = np.flatnonzero(new_map != dmap)
+            if changed.size == 0:
+                continue
+            delta, rows, new_idx = _try(new_map, dmap, idx, changed)
+            if delta > 1e-9:
+                score += delta
+                idx[rows] = new_idx
+                dmap = new_map
+                improved = True
+            else:
+                perm[a], perm[b] = perm[b], perm[a]
+    return score, k1, perm
+
+
+def _restart(seed: int):
+    """
+    One independent restart: climb freely first, then project the result on
+    each k1 class and finish the climb inside the Task 2 key space.
+    """
+    rng = np.random.default_rng(seed)
+    dmap = _climb_substitution(rng)
+    return max((_climb_keyed(project(dmap, k1), k1, rng) for k1 in REPRESENTATIVE_K1),
+               key=lambda result: result[0])
+
+
+def solve(ciphertext: str, table: np.ndarray, reference: float,
+          workers: int = 1, max_restarts: int = 20, confidence: float = 0.95,
+          seed: int = None) -> dict:
+    """
+    Recover (k1, k2) from ciphertext only.
+
+    Restarts run on a process pool when workers > 1 and stop as soon as a
+    result reaches the confidence threshold (reference score / mean score).
+    The returned k2 is the full 26-letter permutation, which build_perm_from_k2
+    accepts as a keyword.
+    """
+    seeds = np.random.SeedSequence(seed).generate_state(max_restarts)
+    total = len(to_letters(ciphertext)) - 3
+    best = None
+    done = 0
+
+    def confidence_of(score):
+        return reference / (score / total)
+
+    if workers == 1:
+        _init_worker(table, ciphertext)
+        for task_seed in seeds:
+            result = _restart(int(task_seed))
+            done += 1
+            if best is None or result[0] > best[0]:
+                best = result
+            if confidence_of(best[0]) >= confidence:
+                break
+    else:
+        stop = multiprocessing.Event()
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(table, ciphertext, stop)) as pool:
+            pending = {pool.submit(_restart, int(task_seed)) for task_seed in seeds}
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    result = future.result()
+                    done += 1
+                    if best is None or result[0] > best[0]:
+                        best = result
+                if confidence_of(best[0]) >= confidence:
+                    # Cancel queued restarts and cut the running ones short
+                    stop.set()
+                    for future in pending:
+                        future.cancel()
+                    break
+
+    score, k1, perm = best
+    k2 = "".join(ALPHABET[i] for i in perm)
+    letters = "".join(ALPHABET[i] for i in to_letters(ciphertext))
+    return {
+        'k1': k1,
+        'k2': k2,
+        'plaintext': caesar2_decrypt(letters, k1, k2),
+        'score': score,
+        'confidence': confidence_of(score),
+        'restarts': done,
+    }
+
+
+def benchmark(corpus_path: str, table: np.ndarray, reference: float,
+              sizes=(1_000, 10_000, 100_000), worker_counts=None, seed: int = 1):
+    """Print wall-clock solve times for several ciphertext sizes and pool sizes."""
+    if worker_counts is None:
+        worker_counts = sorted({1, 4, os.cpu_count() or 1})
+    rng = np.random.default_rng(seed)
+    with open(corpus_path, "rb") as f:
+        letters = "".join(ALPHABET[i] for i in to_letters(f.read(4 * max(sizes))))
+    cipher = get_cipher(7, "CRYPTOGRAPHY")
+
+    print(f"{'Size':>8} {'Workers':>8} {'Time (s)':>9} {'Restarts':>9} {'Solved':>7}")
+    for size in sizes:
+        start = int(rng.integers(0, len(letters) - size))
+        plaintext = letters[start:start + size]
+        ciphertext = cipher.encrypt(plaintext)
+        for workers in worker_counts:
+            t0 = time.perf_counter()
+            result = solve(ciphertext, table, reference, workers=workers, seed=seed)
+            elapsed = time.perf_counter() - t0
+            solved = result['plaintext'] == plaintext
+            print(f"{size:>8} {workers:>8} {elapsed:>9.2f} "
+                  f"{result['restarts']:>9} {str(solved):>7}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Recover k1 and the permuted alphabet of a Task 2 ciphertext.")
+    parser.add_argument("--corpus", required=True,
+                        help="English training text for quadgram statistics")
+    parser.add_argument("-i", "--input", help="ciphertext file")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--restarts", type=int, default=20,
+                        help="maximum number of hill-climbing restarts")
+    parser.add_argument("--confidence", type=float, default=0.95,
+                        help="stop once this confidence is reached (0–1)")
+    parser.add_argument("--k1", type=int,
+                        help="express the key with this k1 if it is equivalent")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="time 1 KB, 10 KB and 100 KB ciphertexts on 1, 4 and all cores")
+    args = parser.parse_args(argv)
+
+    table, reference = load_quadgrams(args.corpus)
+    if args.benchmark:
+        benchmark(args.corpus, table, reference)
+        return
+    if not args.input:
+        parser.error("the ciphertext file (-i) is required unless --benchmark is used")
+
+    with open(args.input, encoding="utf-8") as f:
+        ciphertext = f.read()
+    result = solve(ciphertext, table, reference, args.workers,
+                   args.restarts, args.confidence)
+
+    k1, k2 = result['k1'], result['k2']
+    if args.k1 is not None:
+        perm = perm_for_k1(k2, k1, args.k1)
+        if perm is None:
+            print(f"k1 = {args.k1} is not equivalent to the recovered key.")
+        else:
+            k1, k2 = args.k1, "".join(perm)
+
+    print(f"k1 = {k1}")
+    print(f"k2 (permuted alphabet) = {k2}")
+    print(f"Confidence: {result['confidence']:.3f} after {result['restarts']} restarts")
+    print(f"Plaintext: {result['plaintext'][:500]}")
+
+
+if __name__ == "__main__":
+    main()
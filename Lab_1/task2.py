@@ -1,6 +1,10 @@
+from functools import lru_cache
+
 # Import common functions from task1
 from task1 import ALPHABET, validate_text, normalize_text
 
+CIPHER_CACHE_SIZE = 256  # compiled (k1, k2) ciphers kept in memory
+
 
 def read_key1() -> int:
     """Read Caesar shift key k1 in [1..25]."""
@@ -56,28 +60,103 @@ def build_perm_from_k2(k2: str):
     return perm, L2N, N2L
 
 
+def normalize_k2(k2: str) -> str:
+    """
+    Letters of k2 that actually shape the permutation: uppercased, in order,
+    first occurrences only. Keywords with the same result are equivalent.
+    """
+    seen = set()
+    letters = []
+    for ch in k2.upper():
+        if ch in ALPHABET and ch not in seen:
+            seen.add(ch)
+            letters.append(ch)
+    return "".join(letters)
+
+
+class Caesar2Cipher:
+    """
+    Compiled keyed Caesar cipher: the permutation and the shift are folded
+    into one substitution table per direction, built once per (k1, k2).
+    Tables also apply normalize_text (lowercase folding, space removal).
+    """
+
+    def __init__(self, k1: int, k2: str):
+        perm, _, _ = build_perm_from_k2(k2)
+        plain = "".join(perm)
+        shifted = "".join(perm[(i + k1) % 26] for i in range(26))
+        self.k1 = k1
+        self.k2 = normalize_k2(k2)
+        self.encrypt_table = str.maketrans(plain + plain.lower(), shifted * 2, " ")
+        self.decrypt_table = str.maketrans(shifted + shifted.lower(), plain * 2, " ")
+
+    @staticmethod
+    def _translate(text: str, table: dict) -> str:
+        result = text.translate(table)
+        if result.isascii() and (result.isalpha() or not result):
+            return result
+        # Rare letters such as 'ı' pass validate_text and upper-case into A-Z
+        result = normalize_text(text).translate(table)
+        if result.isascii() and result.isalpha():
+            return result
+        raise ValueError("Text must contain only letters A–Z/a–z and spaces.")
+
+    def _translate_many(self, messages, table: dict) -> list[str]:
+        messages = list(messages)
+        # One translate over the joined batch; newline is never a valid letter
+        joined = "\n".join(messages).translate(table)
+        if joined.isascii() and joined.replace("\n", "").isalpha():
+            results = joined.split("\n")
+            if len(results) == len(messages):
+                return results
+        # Slow path: per-message checks give the same errors as encrypt()
+        return [self._translate(m, table) for m in messages]
+
+    def encrypt(self, plaintext: str) -> str:
+        """Encrypt one message with the precomputed table."""
+        return self._translate(plaintext, self.encrypt_table)
+
+    def decrypt(self, ciphertext: str) -> str:
+        """Decrypt one message with the precomputed table."""
+        return self._translate(ciphertext, self.decrypt_table)
+
+    def encrypt_many(self, messages) -> list[str]:
+        """Encrypt a list or iterator of messages, results in the same order."""
+        return self._translate_many(messages, self.encrypt_table)
+
+    def decrypt_many(self, messages) -> list[str]:
+        """Decrypt a list or iterator of messages, results in the same order."""
+        return self._translate_many(messages, self.decrypt_table)
+
+
+@lru_cache(maxsize=CIPHER_CACHE_SIZE)
+def _compiled_cipher(k1: int, k2: str) -> Caesar2Cipher:
+    return Caesar2Cipher(k1, k2)
+
+
+def get_cipher(k1: int, k2: str) -> Caesar2Cipher:
+    """Compiled cipher for (k1, k2) from a bounded LRU cache."""
+    return _compiled_cipher(k1 % 26, normalize_k2(k2))
+
+
 def caesar2_encrypt(plaintext: str, k1: int, k2: str) -> str:
     """Encrypt on the permuted alphabet with shift k1."""
-    _, L2N, N2L = build_perm_from_k2(k2)
-    P = normalize_text(plaintext)
-    result = []
-    for ch in P:
-        x = L2N[ch]           # 0..25 in permuted alphabet
-        y = (x + k1) % 26     # shift
-        result.append(N2L[y])
-    return "".join(result)
+    return get_cipher(k1, k2).encrypt(plaintext)
 
 
 def caesar2_decrypt(ciphertext: str, k1: int, k2: str) -> str:
     """Decrypt on the permuted alphabet with shift k1."""
-    _, L2N, N2L = build_perm_from_k2(k2)
-    C = normalize_text(ciphertext)
-    result = []
-    for ch in C:
-        y = L2N[ch]
-        x = (y - k1) % 26
-        result.append(N2L[x])
-    return "".join(result)
+    return get_cipher(k1, k2).decrypt(ciphertext)
+
+
+def encrypt_many(messages, k1: int, k2: str) -> list[str]:
+    """Encrypt many messages under one (k1, k2) pair."""
+    return get_cipher(k1, k2).encrypt_many(messages)
+
+
+def decrypt_many(messages, k1: int, k2: str) -> list[str]:
+    """Decrypt many messages under one (k1, k2) pair."""
+    return get_cipher(k1, k2).decrypt_many(messages)
 
 
 def main():
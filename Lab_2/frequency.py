@@ -0,0 +1,256 @@
+"""
+Streaming n-gram frequency engine for the Lab 2 cryptanalysis workflow.
+
+Counts unigrams, bigrams, trigrams and quadgrams of the letters A-Z into
+flat NumPy arrays (index = base-26 number of the n-gram) using bincount.
+Text is consumed in chunks from memory, files or memory-mapped buffers, so
+corpora of several GB never have to fit in memory.
+
+Counters are mergeable: each one remembers its first and last three
+symbols, so counters of adjacent shards (e.g. counted in separate
+processes) can be reduced into exactly the counts of the whole text,
+including the n-grams that cross shard boundaries.
+"""
+
+import argparse
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+MAX_N = 4
+GAP = 26  # symbol for any non-letter when n-grams must stay inside words
+DEFAULT_CHUNK_SIZE = 1 << 22  # 4 MiB per read
+
+# bytes.translate table: 0..25 for A-Z/a-z, GAP for everything else
+_LETTER_BYTES = (ALPHABET + ALPHABET.lower()).encode("ascii")
+SYMBOL_TABLE = bytes(ALPHABET.index(chr(b).upper()) if b in _LETTER_BYTES else GAP
+                     for b in range(256))
+NON_LETTERS = bytes(b for b in range(256) if b not in _LETTER_BYTES)
+
+
+def ngram_to_index(ngram: str) -> int:
+    """Position of an n-gram such as 'THE' in the count array of its order."""
+    index = 0
+    for ch in ngram.upper():
+        index = index * 26 + ALPHABET.index(ch)
+    return index
+
+
+def index_to_ngram(index: int, n: int) -> str:
+    """Inverse of ngram_to_index."""
+    letters = []
+    for _ in range(n):
+        index, r = divmod(index, 26)
+        letters.append(ALPHABET[r])
+    return "".join(reversed(letters))
+
+
+class NGramCounter:
+    """
+    Counts of n-grams of order 1..4 over the letters A-Z.
+
+    By default non-letters are skipped, so n-grams run across word
+    boundaries (the usual convention for solver statistics). With
+    within_words=True every non-letter breaks the sequence instead.
+    """
+
+    def __init__(self, within_words: bool = False):
+        self.within_words = within_words
+        self.counts = [np.zeros(26 ** n, dtype=np.int64) for n in range(1, MAX_N + 1)]
+        self.length = 0                        # symbols seen so far
+        self.head = np.empty(0, dtype=np.int32)  # first MAX_N - 1 symbols
+        self.tail = np.empty(0, dtype=np.int32)  # last MAX_N - 1 symbols
+
+    # -- access -----------------------------------------------------------
+
+    def __getitem__(self, n: int) -> np.ndarray:
+        """Count array of order n (1 = letters, 2 = digraphs, ...)."""
+        return self.counts[n - 1]
+
+    @property
+    def unigrams(self) -> np.ndarray:
+        return self.counts[0]
+
+    @property
+    def bigrams(self) -> np.ndarray:
+        return self.counts[1]
+
+    @property
+    def trigrams(self) -> np.ndarray:
+        return self.counts[2]
+
+    @property
+    def quadgrams(self) -> np.ndarray:
+        return self.counts[3]
+
+    def total(self, n: int = 1) -> int:
+        return int(self.counts[n - 1].sum())
+
+    def frequencies(self, n: int = 1) -> np.ndarray:
+        """Relative frequencies of order n (all zeros for an empty counter)."""
+        counts = self.counts[n - 1]
+        return counts / max(int(counts.sum()), 1)
+
+    def most_common(self, n: int = 1, k: int = 10) -> list[tuple[str, int]]:
+        """The k most frequent n-grams of order n as (ngram, count)."""
+        counts = self.counts[n - 1]
+        k = min(k, int(np.count_nonzero(counts)))
+        top = np.argpartition(counts, -k)[-k:] if k else np.empty(0, dtype=np.intp)
+        top = top[np.argsort(-counts[top], kind="stable")]
+        return [(index_to_ngram(int(i), n), int(counts[i])) for i in top]
+
+    # -- counting ---------------------------------------------------------
+
+    def _count_windows(self, seq: np.ndarray, first: int, last: int) -> None:
+        """
+        Count every n-gram of seq that starts in [first - n + 1, last) and
+        fits in seq. With last = len(seq) these are the n-grams touching
+        seq[first:]; with last = first, the ones crossing position first.
+        """
+        codes = seq
+        valid = seq != GAP if self.within_words else None
+        for n in range(1, MAX_N + 1):
+            if n > 1:
+                codes = codes[:-1] * 26 + seq[n - 1:]
+                if valid is not None:
+                    valid = valid[:-1] & (seq[n - 1:] != GAP)
+            lo = max(first - n + 1, 0)
+            hi = min(last, len(codes))
+            if lo < hi:
+                window = codes[lo:hi] if valid is None else codes[lo:hi][valid[lo:hi]]
+                self.counts[n - 1] += np.bincount(window, minlength=26 ** n)
+
+    def _symbols(self, data) -> np.ndarray:
+        # translate runs in C and drops non-letters in the same pass
+        delete = b"" if self.within_words else NON_LETTERS
+        symbols = bytes(data).translate(SYMBOL_TABLE, delete)
+        return np.frombuffer(symbols, dtype=np.uint8).astype(np.int32)
+
+    def _append(self, symbols: np.ndarray) -> None:
+        """Count symbols that directly follow everything counted so far."""
+        if len(symbols) == 0:
+            return
+        seq = np.concatenate((self.tail, symbols))
+        self._count_windows(seq, len(self.tail), len(seq))
+        if len(self.head) < MAX_N - 1:
+            self.head = np.concatenate((self.head, symbols))[:MAX_N - 1]
+        self.tail = seq[-(MAX_N - 1):]
+        self.length += len(symbols)
+
+    def update(self, data) -> "NGramCounter":
+        """Count a str or bytes-like buffer appended to the text seen so far."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._append(self._symbols(data))
+        return self
+
+    def update_stream(self, src, chunk_size: int = DEFAULT_CHUNK_SIZE) -> "NGramCounter":
+        """Count a binary stream chunk by chunk."""
+        while chunk := src.read(chunk_size):
+            self.update(chunk)
+        return self
+
+    def merge(self, other: "NGramCounter") -> "NGramCounter":
+        """
+        Add the counts of a counter for the text that directly follows this
+        one. N-grams spanning the boundary are counted from head/tail.
+        """
+        if other.within_words != self.within_words:
+            raise ValueError("Cannot merge counters with different word modes.")
+        for mine, theirs in zip(self.counts, other.counts):
+            mine += theirs
+        seq = np.concatenate((self.tail, other.head))
+        self._count_windows(seq, len(self.tail), len(self.tail))
+
+        if self.length < MAX_N - 1:
+            self.head = np.concatenate((self.head, other.head))[:MAX_N - 1]
+        self.tail = np.concatenate((self.tail, other.tail))[-(MAX_N - 1):] \
+            if other.length < MAX_N - 1 else other.tail
+        self.length += other.length
+        return self
+
+    def __add__(self, other: "NGramCounter") -> "NGramCounter":
+        result = NGramCounter(self.within_words)
+        return result.merge(self).merge(other)
+
+
+def count_text(text, within_words: bool = False) -> NGramCounter:
+    """Counter for an in-memory str or bytes object."""
+    return NGramCounter(within_words).update(text)
+
+
+def count_range(path: str, start: int = 0, end: int = None, within_words: bool = False,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> NGramCounter:
+    """
+    Count bytes [start, end) of a file through a read-only memory map.
+    Only chunk_size bytes are touched at a time, the OS pages the rest.
+    """
+    counter = NGramCounter(within_words)
+    size = os.path.getsize(path)
+    end = size if end is None else min(end, size)
+    if start >= end:
+        return counter
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            for offset in range(start, end, chunk_size):
+                counter.update(view[offset:min(offset + chunk_size, end)])
+        finally:
+            view.release()
+    return counter
+
+
+def count_file(path: str, within_words: bool = False, workers: int = 1,
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> NGramCounter:
+    """
+    Count a whole file. With workers > 1 the file is cut into byte shards
+    that are counted in separate processes and merged in order.
+    """
+    size = os.path.getsize(path)
+    if workers <= 1 or size < 2 * chunk_size:
+        return count_range(path, 0, size, within_words, chunk_size)
+
+    bounds = np.linspace(0, size, workers + 1, dtype=np.int64)
+    with ProcessPoolExecutor(workers) as pool:
+        shards = pool.map(count_range, [path] * workers, bounds[:-1].tolist(),
+                          bounds[1:].tolist(), [within_words] * workers,
+                          [chunk_size] * workers)
+        counter = NGramCounter(within_words)
+        for shard in shards:
+            counter.merge(shard)
+    return counter
+
+
+def print_report(counter: NGramCounter, top: int = 10) -> None:
+    """Print the frequency tables used in the manual analysis."""
+    total = counter.total(1)
+    print(f"Letters counted: {total}")
+    print("\nLetter frequencies:")
+    for letter, count in counter.most_common(1, 26):
+        print(f"  {letter}: {100 * count / max(total, 1):6.2f}%  ({count})")
+    for n, name in ((2, "digraphs"), (3, "trigraphs"), (4, "quadgrams")):
+        common = ", ".join(f"{g} ({c})" for g, c in counter.most_common(n, top))
+        print(f"\nMost common {name}: {common}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Letter and n-gram frequency analysis of a text file.")
+    parser.add_argument("path", help="text or ciphertext file")
+    parser.add_argument("--top", type=int, default=10,
+                        help="n-grams to list per order (default: 10)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="processes used to count shards of the file")
+    parser.add_argument("--within-words", action="store_true",
+                        help="do not count n-grams across spaces and punctuation")
+    args = parser.parse_args(argv)
+
+    counter = count_file(args.path, args.within_words, args.workers)
+    print_report(counter, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Precompiled n-gram score tables for the Lab 2 solvers.
+
+The build step turns the reference letter frequencies from the README and
+bigram/trigram/quadgram counts of a training corpus into log10-probability
+tables saved as .npy files. Solvers open them with np.load(mmap_mode="r"):
+only the header is read at startup, the data is paged in on demand, and all
+worker processes share one page-cached copy of each file.
+"""
+
+import argparse
+import math
+import os
+import re
+
+import numpy as np
+
+from frequency import ALPHABET, NGramCounter, count_file
+
+LAB_DIR = os.path.dirname(os.path.abspath(__file__))
+TABLE_DIR = os.path.join(LAB_DIR, "tables")
+README_PATH = os.path.join(LAB_DIR, "README.md")
+TABLE_NAMES = {1: "letters", 2: "bigrams", 3: "trigrams", 4: "quadgrams"}
+
+
+def readme_letter_frequencies(path: str = README_PATH) -> np.ndarray:
+    """Letter probabilities from the 'English Letter Frequencies' table in the README."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    section = text.split("English Letter Frequencies", 1)[-1]
+    found = dict(re.findall(r"\b([A-Z]): (\d+\.\d+)%", section))
+    missing = [ch for ch in ALPHABET if ch not in found]
+    if missing:
+        raise ValueError(f"No reference frequency for {', '.join(missing)} in {path}.")
+    freq = np.array([float(found[ch]) for ch in ALPHABET])
+    return freq / freq.sum()
+
+
+def log_probabilities(counts: np.ndarray) -> np.ndarray:
+    """log10 probabilities as float32, unseen n-grams get log10(0.01 / total)."""
+    total = float(counts.sum())
+    if total == 0:
+        raise ValueError("Cannot build a score table from empty counts.")
+    table = np.full(counts.shape, math.log10(0.01 / total), dtype=np.float32)
+    seen = counts > 0
+    table[seen] = np.log10(counts[seen] / total)
+    return table
+
+
+def table_path(n: int, directory: str = TABLE_DIR) -> str:
+    return os.path.join(directory, f"{TABLE_NAMES[n]}.npy")
+
+
+def _save(path: str, table: np.ndarray) -> None:
+    # Write next to the target and rename, so readers never see a partial file
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, table)
+    os.replace(tmp, path)
+
+
+def build_tables(corpus_paths, directory: str = TABLE_DIR, workers: int = 1) -> list[str]:
+    """
+    Compile all score tables into directory. Letter scores come from the
+    README reference table; n-gram orders 2..4 come from the corpora.
+    Returns the paths written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    counter = NGramCounter()
+    for path in corpus_paths:
+        # Separate corpora: add the counts, no n-gram runs across two files
+        for mine, theirs in zip(counter.counts, count_file(path, workers=workers).counts):
+            mine += theirs
+
+    written = []
+    letters = np.log10(readme_letter_frequencies()).astype(np.float32)
+    for n in TABLE_NAMES:
+        table = letters if n == 1 else log_probabilities(counter[n])
+        path = table_path(n, directory)
+        _save(path, table)
+        written.append(path)
+    return written
+
+
+def load_table(n: int, directory: str = TABLE_DIR) -> np.ndarray:
+    """Read-only memory map of the log10-probability table of order n."""
+    path = table_path(n, directory)
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"{path} not found - build the tables first: "
+            f"python ngram_tables.py CORPUS [CORPUS ...]")
+    table = np.load(path, mmap_mode="r")
+    if table.shape != (26 ** n,):
+        raise ValueError(f"{path} has shape {table.shape}, expected ({26 ** n},).")
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compile letter and n-gram score tables for the solvers.")
+    parser.add_argument("corpus", nargs="+", help="English training text file(s)")
+    parser.add_argument("--out", default=TABLE_DIR,
+                        help="output directory (default: Lab_2/tables)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="processes used to count each corpus")
+    args = parser.parse_args(argv)
+
+    for path in build_tables(args.corpus, args.out, args.workers):
+        print(f"Wrote {path} ({os.path.getsize(path) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Automatic monoalphabetic substitution solver.
+
+Replaces the manual steps of the lab (V→e, W→t, pattern guessing) with:
+1. a frequency-ranked starting key (most frequent cipher letter → E, ...);
+2. simulated annealing over letter swaps, scored with English quadgram
+   log-probabilities.
+
+The ciphertext is reduced to its distinct quadgrams with counts. A swap
+only changes the plaintext of quadgrams that contain one of the two
+swapped cipher letters, so the score is updated by the delta over those
+quadgrams instead of rescoring the whole text. Independent annealing chains
+run on a process pool and the best key wins.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from frequency import ALPHABET, NGramCounter, count_file, count_text
+from ngram_tables import TABLE_DIR, load_table, log_probabilities
+
+# Reference order of English letters, from the frequency table in the README
+ENGLISH_ORDER = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+QUAD_WEIGHTS = np.array([26 ** 3, 26 ** 2, 26, 1])
+
+
+def frequency_key(counter: NGramCounter) -> np.ndarray:
+    """Starting key: cipher letters ranked by count are mapped to ENGLISH_ORDER."""
+    ranked = np.argsort(-counter.unigrams, kind="stable")
+    key = np.empty(26, dtype=np.intp)
+    key[ranked] = [ALPHABET.index(ch) for ch in ENGLISH_ORDER]
+    return key
+
+
+class QuadgramScorer:
+    """Delta scoring of key swaps over the distinct quadgrams of a ciphertext."""
+
+    def __init__(self, ciphertext: str, table: np.ndarray):
+        counter = count_text(ciphertext)
+        codes = np.flatnonzero(counter.quadgrams)
+        if len(codes) == 0:
+            raise ValueError("Ciphertext must contain at least 4 letters.")
+        self.table = table
+        self.counts = counter.quadgrams[codes].astype(np.float64)
+        self.quads = np.stack([codes // w % 26 for w in QUAD_WEIGHTS], axis=1)
+        self.touching = np.stack([(self.quads == y).any(axis=1) for y in range(26)])
+        self.start_key = frequency_key(counter)
+
+    def index(self, key: np.ndarray, rows=slice(None)) -> np.ndarray:
+        return key[self.quads[rows]] @ QUAD_WEIGHTS
+
+    def score(self, key: np.ndarray) -> float:
+        return float(self.counts @ self.table[self.index(key)])
+
+    def swap_delta(self, key: np.ndarray, idx: np.ndarray, a: int, b: int):
+        """
+        Score change of swapping the plaintext letters of cipher letters a
+        and b. Returns (delta, rows, new_idx) so an accepted move can update
+        the cached quadgram indices without recomputing them.
+        """
+        rows = np.flatnonzero(self.touching[a] | self.touching[b])
+        key[a], key[b] = key[b], key[a]
+        new_idx = self.index(key, rows)
+        key[a], key[b] = key[b], key[a]
+        delta = float(self.counts[rows] @ (self.table[new_idx] - self.table[idx[rows]]))
+        return delta, rows, new_idx
+
+
+def anneal(scorer: QuadgramScorer, seed: int, steps: int = 20000,
+           start_temp: float = 10.0, end_temp: float = 0.05):
+    """
+    One simulated-annealing chain from the frequency-ranked key.
+    Returns (best score, best key).
+    """
+    rng = np.random.default_rng(seed)
+    key = scorer.start_key.copy()
+    if seed:
+        # Chains other than the first start from a few random swaps away
+        for a, b in rng.integers(0, 26, size=(4, 2)):
+            key[a], key[b] = key[b], key[a]
+    idx = scorer.index(key)
+    score = float(scorer.counts @ scorer.table[idx])
+    best_score, best_key = score, key.copy()
+
+    cooling = (end_temp / start_temp) ** (1.0 / max(steps - 1, 1))
+    temp = start_temp
+    pairs = rng.integers(0, 26, size=(steps, 2))
+    thresholds = np.log(rng.random(steps))
+    for step in range(steps):
+        a, b = pairs[step]
+        if a != b:
+            delta, rows, new_idx = scorer.swap_delta(key, idx, a, b)
+            # Metropolis rule: always accept better, worse with exp(delta/T)
+            if delta >= 0 or delta / temp > thresholds[step]:
+                key[a], key[b] = key[b], key[a]
+                idx[rows] = new_idx
+                score += delta
+                if score > best_score:
+                    best_score, best_key = score, key.copy()
+        temp *= cooling
+    return best_score, best_key
+
+
+# Worker state, set once per process by _init_worker
+_scorer = None
+
+
+def _init_worker(ciphertext, table):
+    global _scorer
+    if isinstance(table, str):
+        # Each worker maps the same file, so the pages are shared between them
+        table = load_table(4, table)
+    _scorer = QuadgramScorer(ciphertext, table)
+
+
+def _run_chain(seed, steps):
+    return anneal(_scorer, seed, steps)
+
+
+def decrypt_with_key(ciphertext: str, key) -> str:
+    """Apply a cipher→plain key, keeping case, spaces and punctuation."""
+    plain = "".join(ALPHABET[i] for i in key)
+    table = str.maketrans(ALPHABET + ALPHABET.lower(), plain + plain.lower())
+    return ciphertext.translate(table)
+
+
+def solve(ciphertext: str, table=TABLE_DIR, chains: int = 8, workers: int = 1,
+          steps: int = 20000, seed: int = 0) -> dict:
+    """
+    Run independent annealing chains and return the best key and plaintext.
+    table is a quadgram table or the directory of the compiled tables.
+    key maps cipher letters A..Z to plaintext letters (as in the README).
+    """
+    seeds = [seed + i for i in range(chains)]
+    if workers <= 1:
+        _init_worker(ciphertext, table)
+        results = [_run_chain(s, steps) for s in seeds]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(ciphertext, table)) as pool:
+            results = list(pool.map(_run_chain, seeds, [steps] * chains))
+
+    score, key = max(results, key=lambda result: result[0])
+    key_str = "".join(ALPHABET[i] for i in key).lower()
+    return {
+        'key': key_str,
+        'score': score,
+        'plaintext': decrypt_with_key(ciphertext, key),
+        'chain_scores': sorted((r[0] for r in results), reverse=True),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Break a monoalphabetic substitution cipher automatically.")
+    parser.add_argument("path", help="ciphertext file")
+    parser.add_argument("--tables", default=TABLE_DIR,
+                        help="directory of tables built by ngram_tables.py")
+    parser.add_argument("--corpus",
+                        help="build quadgram statistics from this text instead")
+    parser.add_argument("--chains", type=int, default=8,
+                        help="independent annealing chains (default: 8)")
+    parser.add_argument("--steps", type=int, default=20000,
+                        help="annealing steps per chain (default: 20000)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        table = log_probabilities(count_file(args.corpus).quadgrams)
+    else:
+        table = args.tables
+    with open(args.path, encoding="utf-8") as f:
+        ciphertext = f.read()
+
+    t0 = time.perf_counter()
+    result = solve(ciphertext, table, args.chains, args.workers, args.steps, args.seed)
+    elapsed = time.perf_counter() - t0
+
+    print(f"Cipher:    {' '.join(ALPHABET)}")
+    print(f"Plaintext: {' '.join(result['key'])}")
+    print(f"\nSolved in {elapsed:.2f} s (best score {result['score']:.1f})\n")
+    print(result['plaintext'])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Ciphertext-only attack on the Playfair cipher (command line)
+"""
+
+import argparse
+import os
+import sys
+
+from src.attack.annealing import crack
+from src.attack.dictionary import dictionary_attack, read_wordlist
+from src.attack.language import LanguageModel
+from src.cli import add_alphabet_arguments, alphabet_config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Spargerea cifrului Playfair doar din criptogramă.")
+    parser.add_argument("ciphertext", help="fișierul cu criptograma")
+    parser.add_argument("--corpus", required=True,
+                        help="text de antrenare în limba mesajului (statistici de cvadrigrame)")
+    add_alphabet_arguments(parser)
+    parser.add_argument("--wordlist", help="atac cu dicționar: testează cheile din acest fișier")
+    parser.add_argument("--chains", type=int, default=4, help="lanțuri de călire independente")
+    parser.add_argument("--steps", type=int, default=200000, help="pași maximi per lanț")
+    parser.add_argument("--patience", type=int, default=30000,
+                        help="pași fără îmbunătățire după care un lanț se oprește")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    
+    config = alphabet_config(args)
+    with open(args.ciphertext, encoding="utf-8") as f:
+        ciphertext = f.read()
+    
+    try:
+        model = LanguageModel.from_file(config, args.corpus)
+        if args.wordlist:
+            result = dictionary_attack(ciphertext, model, read_wordlist(args.wordlist), args.workers)
+        else:
+            result = crack(ciphertext, model, args.chains, args.workers, args.steps,
+                           args.patience, seed=args.seed)
+    except ValueError as e:
+        print(f"Eroare: {e}")
+        sys.exit(1)
+    
+    if args.wordlist:
+        print(f"\nChei testate: {result['tested']:,} în {result['elapsed']:.1f} s "
+              f"({result['rate'] * 60:,.0f} chei/minut), {result['duplicates']:,} duplicate, "
+              f"{result['invalid']:,} invalide")
+        if result['key'] is None:
+            print("Nicio cheie din dicționar nu dă un text plauzibil.")
+            return
+        print(f"Cheia găsită: {result['key']} (scor mediu {result['score']:.2f})")
+    else:
+        rate = result['iterations'] / result['elapsed'] if result['elapsed'] else 0.0
+        print(f"\nCheia găsită: {result['key']}")
+        print(f"Scor: {result['score']:.1f} ({len(result['chains'])} lanțuri, "
+              f"{result['iterations']:,} iterații în {result['elapsed']:.1f} s, {rate:,.0f} iterații/s)")
+        if result['stopped_early']:
+            print("Oprire anticipată: lanțurile au convergent spre același text.")
+    print(f"\nTextul decriptat:\n{result['plaintext']}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,13 +1,19 @@
 """
 Main entry point for the refactored Playfair cipher application
+
+Without arguments the interactive menu starts; with arguments files are
+processed in batch (python main.py encrypt -k KEY -i "texts/*.txt").
 """
 
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.ui.interface import PlayfairUI
-
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from src.cli import main
+        sys.exit(main())
+    
+    from src.ui.interface import PlayfairUI
     app = PlayfairUI()
     app.run()
\ No newline at end of file
@@ -0,0 +1 @@
+# Cryptanalysis package
\ No newline at end of file
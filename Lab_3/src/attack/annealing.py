@@ -0,0 +1,196 @@
+"""
+Ciphertext-only Playfair attack by simulated annealing over matrices
+"""
+
+import math
+import multiprocessing
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import combinations
+
+import numpy as np
+
+from .language import LanguageModel
+from .scoring import MatrixScorer
+
+# Share of moves that swap two letters; the rest swap rows/columns or transpose
+CELL_SWAP_RATE = 0.9
+# Chains that must reach the same plaintext before the search stops early
+AGREEING_CHAINS = 2
+
+
+class PlayfairAnnealer(MatrixScorer):
+    """Simulated annealing over the matrices of one ciphertext"""
+    
+    def __init__(self, ciphertext: str, model: LanguageModel):
+        super().__init__(ciphertext, model)
+        self.moves = self._structural_moves()
+    
+    def _structural_moves(self) -> list[np.ndarray]:
+        """Row swaps, column swaps and transposition that keep empty cells in place"""
+        grid = np.arange(self.cells).reshape(self.rows, self.cols)
+        candidates = []
+        for r1, r2 in combinations(range(self.rows), 2):
+            perm = grid.copy()
+            perm[[r1, r2]] = perm[[r2, r1]]
+            candidates.append(perm.ravel())
+        for c1, c2 in combinations(range(self.cols), 2):
+            perm = grid.copy()
+            perm[:, [c1, c2]] = perm[:, [c2, c1]]
+            candidates.append(perm.ravel())
+        if self.rows == self.cols:
+            candidates.append(grid.T.ravel())
+        return [perm for perm in candidates if (perm[:self.letters] < self.letters).all()]
+    
+    def random_grid(self, rng) -> np.ndarray:
+        empty = np.full(self.cells - self.letters, self.model.empty_code)
+        return np.concatenate([rng.permutation(self.letters), empty])
+    
+    def default_temperature(self) -> float:
+        """Starting temperature, grows with the text length like the score differences"""
+        return 10.0 + 0.087 * max(self.length - 84, 0)
+    
+    def anneal(self, seed: int, steps: int, patience: int, start_temp: float = None,
+               end_temp: float = 0.5, report=None, report_every: int = 5000,
+               stopped=lambda: False) -> dict:
+        """
+        One annealing chain from a random grid. Stops after steps iterations,
+        after patience iterations without a better score, or when stopped()
+        becomes true. report(step, best_score, rate) is called periodically.
+        """
+        rng = np.random.default_rng(seed)
+        start_temp = start_temp or self.default_temperature()
+        grid = self.random_grid(rng)
+        score = self.score(grid)
+        best_score, best_grid = score, grid.copy()
+        
+        cooling = (end_temp / start_temp) ** (1.0 / max(steps - 1, 1))
+        temp = start_temp
+        last_improvement = 0
+        started = time.perf_counter()
+        step = 0
+        converged = False
+        while step < steps:
+            step += 1
+            candidate = grid.copy()
+            if not self.moves or rng.random() < CELL_SWAP_RATE:
+                a, b = rng.choice(self.letters, size=2, replace=False)
+                candidate[a], candidate[b] = candidate[b], candidate[a]
+            else:
+                candidate = candidate[self.moves[rng.integers(len(self.moves))]]
+            
+            candidate_score = self.score(candidate)
+            delta = candidate_score - score
+            # Metropolis rule: always accept better, worse with exp(delta/T)
+            if delta >= 0 or rng.random() < math.exp(delta / temp):
+                grid, score = candidate, candidate_score
+                if score > best_score + 1e-9:
+                    best_score, best_grid = score, grid.copy()
+                    last_improvement = step
+            temp *= cooling
+            
+            if step - last_improvement >= patience:
+                converged = True
+                break
+            if step % report_every == 0:
+                if report is not None:
+                    report(step, best_score, step / (time.perf_counter() - started))
+                if stopped():
+                    break
+        
+        elapsed = time.perf_counter() - started
+        return {
+            'seed': seed,
+            'score': best_score,
+            'key': self.key_of(best_grid),
+            'plaintext': self.plaintext_of(best_grid),
+            'iterations': step,
+            'rate': step / elapsed if elapsed else 0.0,
+            'converged': converged
+        }
+
+
+# Worker state, set once per process by _init_worker
+_annealer = None
+_progress = None
+_stop = None
+
+
+def _init_worker(ciphertext, model, progress, stop):
+    global _annealer, _progress, _stop
+    _annealer = PlayfairAnnealer(ciphertext, model)
+    _progress, _stop = progress, stop
+
+
+def _run_chain(seed, steps, patience, start_temp):
+    def report(step, best_score, rate):
+        _progress.put((seed, step, best_score, rate))
+    return _annealer.anneal(seed, steps, patience, start_temp, report=report,
+                            stopped=_stop.is_set)
+
+
+def _agreement(results: list[dict]) -> bool:
+    """Whether enough converged chains decrypt to the same plaintext"""
+    plaintexts = [r['plaintext'] for r in results if r['converged']]
+    return any(plaintexts.count(p) >= AGREEING_CHAINS for p in plaintexts)
+
+
+def print_progress(chain: int, step: int, steps: int, best_score: float, rate: float) -> None:
+    print(f"Lanțul {chain}: pasul {step}/{steps}, scor maxim {best_score:.1f}, {rate:,.0f} iterații/s")
+
+
+def crack(ciphertext: str, model: LanguageModel, chains: int = 4, workers: int = 1,
+          steps: int = 200000, patience: int = 30000, start_temp: float = None,
+          seed: int = 0, progress=print_progress) -> dict:
+    """
+    Run annealing chains, in parallel when workers > 1, and return the best
+    result with the per-chain summaries. The search stops early once
+    AGREEING_CHAINS converged chains give the same plaintext.
+    """
+    seeds = [seed + i for i in range(chains)]
+    started = time.perf_counter()
+    results = []
+    
+    if workers <= 1:
+        annealer = PlayfairAnnealer(ciphertext, model)
+        for s in seeds:
+            def report(step, best_score, rate, chain=s):
+                if progress is not None:
+                    progress(chain, step, steps, best_score, rate)
+            results.append(annealer.anneal(s, steps, patience, start_temp, report=report))
+            if _agreement(results):
+                break
+    else:
+        progress_queue = multiprocessing.Queue()
+        stop = multiprocessing.Event()
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(ciphertext, model, progress_queue, stop)) as pool:
+            pending = {pool.submit(_run_chain, s, steps, patience, start_temp) for s in seeds}
+            while pending:
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                # Chains cancelled before they started have no result
+                results.extend(f.result() for f in done if not f.cancelled())
+                if _agreement(results):
+                    stop.set()
+                    for future in pending:
+                        future.cancel()
+                try:
+                    while True:
+                        update = progress_queue.get_nowait()
+                        if progress is not None:
+                            progress(update[0], update[1], steps, update[2], update[3])
+                except queue.Empty:
+                    pass
+    
+    elapsed = time.perf_counter() - started
+    best = max(results, key=lambda r: r['score'])
+    return {
+        'key': best['key'],
+        'score': best['score'],
+        'plaintext': best['plaintext'],
+        'chains': sorted(results, key=lambda r: r['score'], reverse=True),
+        'iterations': sum(r['iterations'] for r in results),
+        'elapsed': elapsed,
+        'stopped_early': _agreement(results)
+    }
\ No newline at end of file
@@ -0,0 +1,212 @@
+"""
+Dictionary attack on the Playfair cipher: test every key of a wordlist
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+
+import numpy as np
+
+from .language import LanguageModel
+from .scoring import MatrixScorer
+from ..core.matrix import normalize_key
+
+# Ciphertext letters decrypted for the first, cheap test of each key
+PREFIX_LENGTH = 80
+# Keys sent to a worker at a time, all decrypted together as one array
+BATCH_SIZE = 4096
+# Keys scoring this far (log10 per quadgram) below the language average are rejected
+REJECT_MARGIN = 1.0
+
+
+class KeyNormalizer:
+    """
+    Turns wordlist entries into normalized keys, dropping entries that
+    validate_key would reject and keys whose matrix was already tested.
+    """
+    
+    def __init__(self, alphabet: str, separator: str):
+        self.alphabet = alphabet
+        self.separator = separator
+        self.allowed = set(alphabet + separator)
+        self.seen = set()
+        self.invalid = 0
+        self.duplicates = 0
+    
+    def normalize(self, word: str) -> str | None:
+        """normalize_key of the word, or None to skip it"""
+        key = "".join(word.upper().split())
+        if len(key) < 7 or not self.allowed.issuperset(key):
+            self.invalid += 1
+            return None
+        # dict keeps the first occurrence of each letter, in order
+        normalized = "".join(dict.fromkeys(key)).replace(self.separator, "")
+        if normalized in self.seen:
+            self.duplicates += 1
+            return None
+        self.seen.add(normalized)
+        return normalized
+    
+    def batches(self, words, size: int = BATCH_SIZE):
+        """(words, normalized keys) lists of up to size new keys"""
+        words = iter(words)
+        while True:
+            batch_words, batch_keys = [], []
+            for word in words:
+                normalized = self.normalize(word)
+                if normalized is not None:
+                    batch_words.append(word)
+                    batch_keys.append(normalized)
+                    if len(batch_keys) == size:
+                        break
+            if not batch_keys:
+                return
+            yield batch_words, batch_keys
+
+
+class DictionaryScorer:
+    """Scores batches of normalized keys against one ciphertext"""
+    
+    def __init__(self, ciphertext: str, model: LanguageModel, prefix_length: int = PREFIX_LENGTH):
+        clean = "".join(ciphertext.upper().split())
+        prefix_length = min(prefix_length - prefix_length % 2, len(clean) - len(clean) % 2)
+        self.full = MatrixScorer(clean, model)
+        self.prefix = MatrixScorer(clean[:prefix_length], model)
+        self.threshold = model.mean_score - REJECT_MARGIN
+        
+        alphabet = model.config.alphabet
+        self.letters = len(alphabet)
+        self.empty_code = model.empty_code
+        # Letter -> one-byte code, so a batch of keys converts to codes in one call
+        self.letter_codes = str.maketrans({char: chr(i) for i, char in enumerate(alphabet)})
+        self.default_order = np.arange(self.letters) + self.letters
+    
+    def grids(self, keys: list[str]) -> np.ndarray:
+        """
+        Matrices of all keys at once: a key letter is ranked by its position
+        in the key, the other letters after it in alphabet order.
+        """
+        lengths = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+        codes = np.frombuffer("".join(keys).translate(self.letter_codes).encode("latin-1"),
+                              dtype=np.uint8)
+        rows = np.repeat(np.arange(len(keys)), lengths)
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        
+        rank = np.tile(self.default_order, (len(keys), 1))
+        rank[rows, codes] = np.arange(len(codes)) - starts
+        letters = np.argsort(rank, axis=1)
+        empty = np.full((len(keys), self.full.cells - self.letters), self.empty_code)
+        return np.concatenate([letters, empty], axis=1)
+    
+    def test(self, keys: list[str]) -> list[tuple[float, int]]:
+        """
+        (average quadgram score, index) of the keys whose decryption looks like
+        the language: the prefix is checked for all keys, the full text only
+        for the keys that pass.
+        """
+        grids = self.grids(keys)
+        prefix_scores = self.prefix.score_batch(grids) / max(self.prefix.length - 3, 1)
+        survivors = np.flatnonzero(prefix_scores >= self.threshold)
+        if len(survivors) == 0:
+            return []
+        
+        full_scores = self.full.score_batch(grids[survivors]) / max(self.full.length - 3, 1)
+        return [(float(score), int(index)) for score, index in zip(full_scores, survivors)
+                if score >= self.threshold]
+
+
+# Worker state, set once per process by _init_worker
+_scorer = None
+
+
+def _init_worker(ciphertext, model, prefix_length):
+    global _scorer
+    _scorer = DictionaryScorer(ciphertext, model, prefix_length)
+
+
+def _test_batch(keys):
+    return len(keys), _scorer.test(keys)
+
+
+def print_progress(tested: int, rate: float, best: float | None) -> None:
+    best_text = f", cel mai bun scor {best:.2f}" if best is not None else ""
+    print(f"Chei testate: {tested:,} ({rate * 60:,.0f} chei/minut){best_text}")
+
+
+def read_wordlist(path: str):
+    """Words of a wordlist file, one per line, read lazily"""
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            word = line.strip()
+            if word:
+                yield word
+
+
+def dictionary_attack(ciphertext: str, model: LanguageModel, words, workers: int = 1,
+                      batch_size: int = BATCH_SIZE, prefix_length: int = PREFIX_LENGTH,
+                      stop_on_match: bool = True, progress=print_progress,
+                      report_every: float = 2.0) -> dict:
+    """
+    Try every key of words (any iterable, e.g. read_wordlist(path)) and
+    return the best key whose decryption scores like the language, or None.
+    Batches go to worker processes when workers > 1, with a bounded number
+    in flight so the wordlist is streamed.
+    """
+    normalizer = KeyNormalizer(model.config.alphabet, model.config.separator)
+    batches = normalizer.batches(words, batch_size)
+    matches = []
+    tested = 0
+    started = last_report = time.perf_counter()
+    
+    def collect(batch_words, count, found):
+        nonlocal tested, last_report
+        tested += count
+        matches.extend((score, batch_words[i]) for score, i in found)
+        now = time.perf_counter()
+        if progress is not None and now - last_report >= report_every:
+            best = max(matches)[0] if matches else None
+            progress(tested, tested / (now - started), best)
+            last_report = now
+    
+    if workers <= 1:
+        _init_worker(ciphertext, model, prefix_length)
+        for batch_words, keys in batches:
+            collect(batch_words, *_test_batch(keys))
+            if matches and stop_on_match:
+                break
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(ciphertext, model, prefix_length)) as pool:
+            pending = {}
+            for batch_words, keys in islice(batches, 2 * workers):
+                pending[pool.submit(_test_batch, keys)] = batch_words
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(pending.pop(future), *future.result())
+                if matches and stop_on_match:
+                    for future in pending:
+                        future.cancel()
+                    break
+                for batch_words, keys in islice(batches, len(done)):
+                    pending[pool.submit(_test_batch, keys)] = batch_words
+    
+    elapsed = time.perf_counter() - started
+    best_score, best_key = max(matches) if matches else (None, None)
+    plaintext = None
+    if best_key is not None:
+        scorer = DictionaryScorer(ciphertext, model, prefix_length)
+        grid = scorer.grids([normalize_key(best_key, model.config.alphabet)])[0]
+        plaintext = scorer.full.plaintext_of(grid)
+    return {
+        'key': best_key,
+        'score': best_score,
+        'plaintext': plaintext,
+        'matches': sorted(matches, reverse=True),
+        'tested': tested,
+        'invalid': normalizer.invalid,
+        'duplicates': normalizer.duplicates,
+        'elapsed': elapsed,
+        'rate': tested / elapsed if elapsed else 0.0
+    }
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Quadgram language model for scoring candidate Playfair plaintexts
+"""
+
+import numpy as np
+
+from ..alphabet.config import AlphabetConfig
+from ..utils.helpers import TextPreprocessor
+
+# Score of a quadgram never seen in the training text, relative to one seen once
+UNSEEN_FLOOR = 0.01
+# Extra penalty for plaintext falling on an empty cell of an incomplete matrix
+EMPTY_PENALTY = 10.0
+# The tables hold (N + 2) ** 4 entries; 64 symbols already take about 16.7 million
+MAX_SYMBOLS = 64
+
+
+class LanguageModel:
+    """
+    log10 quadgram probabilities over the alphabet, the separator and a
+    marker for empty matrix cells (symbols 0..N-1, N and N+1).
+    
+    The training text goes through the same preparation as a plaintext
+    before encryption, so separators inserted between doubled letters and at
+    the end are scored the way they appear in real decryptions.
+    """
+    
+    def __init__(self, config: AlphabetConfig, table: np.ndarray, mean_score: float = None):
+        self.config = config
+        self.separator_code = len(config.alphabet)
+        self.empty_code = self.separator_code + 1
+        self.size = self.empty_code + 1
+        self.weights = np.array([self.size ** 3, self.size ** 2, self.size, 1])
+        self.table = table
+        # Average quadgram score of the training text, the level a correct decryption reaches
+        self.mean_score = mean_score
+        self._codes = {char: i for i, char in enumerate(config.alphabet)}
+        self._codes[config.separator] = self.separator_code
+    
+    @classmethod
+    def from_text(cls, config: AlphabetConfig, text: str, chunk_size: int = 1 << 16):
+        """Train on a text in the language of the alphabet"""
+        return cls.from_chunks(config, (text[i:i + chunk_size] for i in range(0, len(text), chunk_size)))
+    
+    @classmethod
+    def from_file(cls, config: AlphabetConfig, path: str, chunk_size: int = 1 << 16):
+        """Train on a text file, read in chunks"""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_chunks(config, iter(lambda: f.read(chunk_size), ""))
+    
+    @classmethod
+    def from_chunks(cls, config: AlphabetConfig, chunks):
+        keep = set(config.alphabet + config.separator)
+        preprocessor = TextPreprocessor(config.separator)
+        # Drop everything the cipher would reject (digits, punctuation, ...)
+        letters = ("".join(filter(keep.__contains__, chunk.upper())) for chunk in chunks)
+        
+        model = cls(config, None)
+        if model.size > MAX_SYMBOLS:
+            raise ValueError(f"Modelul de limbă suportă alfabete de cel mult {MAX_SYMBOLS - 2} litere "
+                             f"(alfabetul are {len(config.alphabet)})!")
+        counts = np.zeros(model.size ** 4, dtype=np.int64)
+        tail = np.zeros(0, dtype=np.int64)
+        for pairs in preprocessor.prepare_chunks(letters):
+            codes = np.concatenate([tail, model.encode("".join(pairs))])
+            if len(codes) >= 4:
+                counts += np.bincount(model.quadgram_index(codes), minlength=len(counts))
+            tail = codes[-3:]
+        
+        total = counts.sum()
+        if total == 0:
+            raise ValueError("Textul de antrenare nu conține litere din alfabet!")
+        table = np.full(len(counts), np.log10(UNSEEN_FLOOR / total), dtype=np.float32)
+        seen = counts > 0
+        table[seen] = np.log10(counts[seen] / total)
+        model.mean_score = float(counts[seen] @ table[seen]) / total
+        
+        # Any quadgram touching an empty cell scores far below unseen ones
+        index = np.arange(len(counts))
+        touches_empty = np.zeros(len(counts), dtype=bool)
+        for weight in model.weights:
+            touches_empty |= index // weight % model.size == model.empty_code
+        table[touches_empty] = table.min() - EMPTY_PENALTY
+        model.table = table
+        return model
+    
+    def encode(self, text: str) -> np.ndarray:
+        """Symbol codes of a prepared or encrypted text"""
+        try:
+            return np.fromiter(map(self._codes.__getitem__, text), dtype=np.int64, count=len(text))
+        except KeyError as e:
+            raise ValueError(f"Caracterul '{e.args[0]}' nu este valid! Folosiți doar litere din alfabetul specificat.") from None
+    
+    def quadgram_index(self, codes: np.ndarray) -> np.ndarray:
+        """Table index of every quadgram of a code array"""
+        return (codes[:-3] * self.weights[0] + codes[1:-2] * self.weights[1]
+                + codes[2:-1] * self.weights[2] + codes[3:])
+    
+    def score(self, codes: np.ndarray) -> float:
+        """Sum of quadgram log-probabilities"""
+        return float(self.table[self.quadgram_index(codes)].sum())
+    
+    def score_batch(self, codes: np.ndarray) -> np.ndarray:
+        """score of every row of a 2-D code array"""
+        index = (codes[:, :-3] * self.weights[0] + codes[:, 1:-2] * self.weights[1]
+                 + codes[:, 2:-1] * self.weights[2] + codes[:, 3:])
+        return self.table[index].sum(axis=1)
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Decryption and scoring of a ciphertext under candidate Playfair matrices
+"""
+
+import numpy as np
+
+from .language import LanguageModel
+from ..utils.helpers import MatrixDimensionCalculator
+
+
+class MatrixScorer:
+    """
+    Decrypts and scores one ciphertext under candidate matrices.
+    
+    A candidate is a grid of symbol codes, the letters in its first N cells
+    and the empty-cell marker in the rest, exactly like a matrix built from a
+    key. Decryption is computed once per distinct ciphertext digraph with
+    array arithmetic on row/column indices, then expanded to the full text.
+    Any number of grids can be processed at once as the rows of a 2-D array.
+    """
+    
+    def __init__(self, ciphertext: str, model: LanguageModel):
+        self.model = model
+        self.letters = len(model.config.alphabet)
+        self.rows, self.cols = MatrixDimensionCalculator.calculate(self.letters)
+        self.cells = self.rows * self.cols
+        
+        clean = "".join(ciphertext.upper().split())
+        if len(clean) < 8 or len(clean) % 2:
+            raise ValueError("Criptograma trebuie să aibă un număr par de litere (cel puțin 8)!")
+        codes = model.encode(clean)
+        self.length = len(codes)
+        
+        pair_ids = codes[0::2] * model.size + codes[1::2]
+        distinct, self.inverse = np.unique(pair_ids, return_inverse=True)
+        self.first, self.second = distinct // model.size, distinct % model.size
+        # Pairs with the separator are left unchanged by the cipher
+        self.transformed = (self.first < self.letters) & (self.second < self.letters)
+    
+    def _source_cells(self, positions1: np.ndarray, positions2: np.ndarray):
+        """Cells holding the plaintext of digraphs at the given cells (decryption rules)"""
+        r1, c1 = np.divmod(positions1, self.cols)
+        r2, c2 = np.divmod(positions2, self.cols)
+        same_row = r1 == r2
+        same_col = (c1 == c2) & ~same_row
+        
+        new_c1 = np.where(same_row, (c1 - 1) % self.cols, np.where(same_col, c1, c2))
+        new_c2 = np.where(same_row, (c2 - 1) % self.cols, np.where(same_col, c2, c1))
+        new_r1 = np.where(same_col, (r1 - 1) % self.rows, r1)
+        new_r2 = np.where(same_col, (r2 - 1) % self.rows, r2)
+        return new_r1 * self.cols + new_c1, new_r2 * self.cols + new_c2
+    
+    def decrypt_codes(self, grid: np.ndarray) -> np.ndarray:
+        """Plaintext symbol codes of the ciphertext under one grid"""
+        positions = np.empty(self.letters, dtype=np.int64)
+        positions[grid[:self.letters]] = np.arange(self.letters)
+        
+        mask = self.transformed
+        cells1, cells2 = self._source_cells(positions[self.first[mask]], positions[self.second[mask]])
+        out1, out2 = self.first.copy(), self.second.copy()
+        out1[mask] = grid[cells1]
+        out2[mask] = grid[cells2]
+        
+        plain = np.empty(self.length, dtype=np.int64)
+        plain[0::2] = out1[self.inverse]
+        plain[1::2] = out2[self.inverse]
+        return plain
+    
+    def decrypt_batch(self, grids: np.ndarray) -> np.ndarray:
+        """decrypt_codes for every row of a 2-D array of grids"""
+        count = len(grids)
+        positions = np.empty((count, self.letters), dtype=np.int64)
+        np.put_along_axis(positions, grids[:, :self.letters],
+                          np.broadcast_to(np.arange(self.letters), (count, self.letters)), axis=1)
+        
+        mask = self.transformed
+        cells1, cells2 = self._source_cells(positions[:, self.first[mask]],
+                                            positions[:, self.second[mask]])
+        out1 = np.tile(self.first, (count, 1))
+        out2 = np.tile(self.second, (count, 1))
+        out1[:, mask] = np.take_along_axis(grids, cells1, axis=1)
+        out2[:, mask] = np.take_along_axis(grids, cells2, axis=1)
+        
+        plain = np.empty((count, self.length), dtype=np.int64)
+        plain[:, 0::2] = out1[:, self.inverse]
+        plain[:, 1::2] = out2[:, self.inverse]
+        return plain
+    
+    def score(self, grid: np.ndarray) -> float:
+        return self.model.score(self.decrypt_codes(grid))
+    
+    def score_batch(self, grids: np.ndarray) -> np.ndarray:
+        return self.model.score_batch(self.decrypt_batch(grids))
+    
+    def key_of(self, grid: np.ndarray) -> str:
+        """Key string that rebuilds the grid (the grid letters in order)"""
+        return "".join(self.model.config.alphabet[code] for code in grid[:self.letters])
+    
+    def plaintext_of(self, grid: np.ndarray) -> str:
+        symbols = self.model.config.alphabet + self.model.config.separator + "?"
+        return "".join(symbols[code] for code in self.decrypt_codes(grid))
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Non-interactive command line for encrypting and decrypting files in batch
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .alphabet.configs import AlphabetConfigs
+from .playfair import PlayfairCipher, STREAM_CHUNK_SIZE
+
+ALPHABETS = {
+    'romanian': AlphabetConfigs.romanian,
+    'english': AlphabetConfigs.english,
+    'russian': AlphabetConfigs.russian
+}
+SUFFIXES = {'encrypt': '.enc', 'decrypt': '.dec'}
+
+
+def add_alphabet_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("-a", "--alphabet", choices=ALPHABETS, default="romanian")
+    parser.add_argument("--custom-alphabet", help="alfabet personalizat, ultima literă este separatorul")
+
+
+def alphabet_config(args):
+    """AlphabetConfig selected on the command line"""
+    if args.custom_alphabet:
+        return AlphabetConfigs.custom(args.custom_alphabet)
+    return ALPHABETS[args.alphabet]()
+
+
+def expand_inputs(patterns: list[str]) -> list[str]:
+    """Files matching the paths or glob patterns, in order, without duplicates"""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) or [pattern]
+        for path in matches:
+            if not os.path.isfile(path):
+                raise ValueError(f"Fișierul nu există: {path}")
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def output_path(path: str, output_dir: str, suffix: str) -> str:
+    name = os.path.basename(path) + suffix
+    return os.path.join(output_dir if output_dir else os.path.dirname(path), name)
+
+
+# Cipher of a worker process, set once by _init_worker
+_cipher = None
+
+
+def _init_worker(config) -> None:
+    global _cipher
+    _cipher = PlayfairCipher(config)
+
+
+def _process_file(mode: str, key: str, src_path: str, dst_path: str, chunk_size: int):
+    """
+    Stream one file through the cipher into a temporary file next to dst_path,
+    which replaces dst_path only on success. Returns (input bytes, error message or None).
+    """
+    size = os.path.getsize(src_path)
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(dst_path) + ".",
+                                    suffix=".tmp", dir=os.path.dirname(dst_path) or ".")
+    try:
+        with open(src_path, encoding="utf-8") as src, open(fd, "w", encoding="utf-8") as dst:
+            getattr(_cipher, f"{mode}_stream")(src, dst, key, chunk_size)
+        os.replace(tmp_path, dst_path)
+    except (ValueError, UnicodeDecodeError) as e:
+        return size, str(e)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return size, None
+
+
+def check_outputs(inputs: list[str], outputs: list[str]) -> None:
+    """Refuse outputs that would overwrite an input file or another output"""
+    sources = {os.path.realpath(path) for path in inputs}
+    targets = set()
+    for path in outputs:
+        target = os.path.realpath(path)
+        if target in sources:
+            raise ValueError(f"Rezultatul ar suprascrie fișierul de intrare: {path} "
+                             "(folosiți un sufix sau alt director de ieșire)")
+        if target in targets:
+            raise ValueError(f"Mai multe fișiere de intrare au același rezultat: {path}")
+        targets.add(target)
+
+
+def run_batch(config, key: str, mode: str, inputs: list[str], output_dir: str = None,
+              suffix: str = None, workers: int = 1, chunk_size: int = STREAM_CHUNK_SIZE) -> dict:
+    """
+    Encrypt or decrypt every input file into output_dir (or next to it),
+    files spread over a process pool. Returns totals and per-file errors.
+    Raises ValueError when an output would overwrite an input.
+    """
+    suffix = SUFFIXES[mode] if suffix is None else suffix
+    outputs = [output_path(path, output_dir, suffix) for path in inputs]
+    check_outputs(inputs, outputs)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    jobs = ([mode] * len(inputs), [key] * len(inputs), inputs, outputs, [chunk_size] * len(inputs))
+    
+    started = time.perf_counter()
+    if workers <= 1:
+        _init_worker(config)
+        results = list(map(_process_file, *jobs))
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(config,)) as pool:
+            results = list(pool.map(_process_file, *jobs))
+    elapsed = time.perf_counter() - started
+    
+    return {
+        'files': len(inputs),
+        'bytes': sum(size for size, _ in results),
+        'elapsed': elapsed,
+        'errors': {path: error for path, (_, error) in zip(inputs, results) if error}
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="main.py", description="Criptare/decriptare Playfair a fișierelor, fără meniu interactiv.")
+    parser.add_argument("mode", choices=SUFFIXES, help="operația")
+    parser.add_argument("-k", "--key", required=True, help="cheia (cel puțin 7 caractere)")
+    parser.add_argument("-i", "--input", nargs="+", required=True, help="fișiere sau șabloane glob")
+    parser.add_argument("-o", "--output-dir", help="directorul rezultatelor (implicit: lângă fișierul sursă)")
+    parser.add_argument("--suffix", help="sufixul fișierelor rezultate (implicit: .enc/.dec)")
+    add_alphabet_arguments(parser)
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=STREAM_CHUNK_SIZE,
+                        help="caractere citite o dată din fiecare fișier")
+    args = parser.parse_args(argv)
+    
+    config = alphabet_config(args)
+    try:
+        PlayfairCipher(config).validator.validate_key(args.key)
+        inputs = expand_inputs(args.input)
+        result = run_batch(config, args.key, args.mode, inputs, args.output_dir, args.suffix,
+                           args.workers, args.chunk_size)
+    except ValueError as e:
+        print(f"Eroare: {e}", file=sys.stderr)
+        return 2
+    
+    for path, error in result['errors'].items():
+        print(f"Eroare în {path}: {error}", file=sys.stderr)
+    
+    elapsed = result['elapsed'] or float("inf")
+    print(f"{result['files']} fișiere, {result['bytes']:,} octeți în {result['elapsed']:.2f} s: "
+          f"{result['bytes'] / elapsed / 1e6:.2f} MB/s, {result['files'] / elapsed:.1f} fișiere/s")
+    return 1 if result['errors'] else 0
\ No newline at end of file
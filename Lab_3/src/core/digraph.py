@@ -0,0 +1,203 @@
+"""
+Precomputed digraph tables for Playfair cipher
+"""
+
+import codecs
+import sys
+from array import array
+from functools import lru_cache
+from operator import add
+
+try:
+    import numpy as np
+except ImportError:  # the digraph results are then gathered in pure Python
+    np = None
+
+# Code point stored for digraphs the matrix cannot transform (incomplete matrices)
+UNDEFINED = 0
+
+# One-byte index of the characters outside the alphabet
+FOREIGN = 0xFF
+
+# The two code points of a pair, gathered as one 64-bit word, decode with this codec
+_PAIR_CODEC = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+
+
+class _IndexTable(dict):
+    """str.translate table: alphabet letter -> its index, any other character -> FOREIGN"""
+    
+    def __missing__(self, code: int) -> int:
+        return FOREIGN
+
+
+@lru_cache(maxsize=None)
+def _index_table(alphabet: str) -> _IndexTable:
+    return _IndexTable({ord(char): i for i, char in enumerate(alphabet)})
+
+
+@lru_cache(maxsize=None)
+def _symbol_table(size: int) -> bytes:
+    """bytes.translate table: symbol codes past the alphabet indices -> FOREIGN"""
+    return bytes(range(size)) + bytes([FOREIGN]) * (256 - size)
+
+
+@lru_cache(maxsize=None)
+def _decoding_table(symbols: str) -> str:
+    """charmap decoding table: symbol code -> symbol"""
+    return symbols + "\ufffe" * (256 - len(symbols))
+
+
+# FOREIGN -> index 0, so the pairs kept unchanged can be gathered with the others
+_CLAMP_TABLE = bytes(range(FOREIGN)) + bytes([0])
+
+
+class DigraphTable:
+    """
+    Every N×N digraph of one compiled matrix, encrypted and decrypted ahead of time.
+    
+    Tables are flat arrays of code points: the digraph (a, b) with alphabet
+    indices (i, j) is stored at offsets 2 * (i * N + j) and 2 * (i * N + j) + 1.
+    A text is transformed by gathering the entry i * N + j of every pair,
+    both code points at once, straight from these arrays: with one NumPy
+    fancy-indexing call when NumPy is installed, with map() otherwise.
+    """
+    
+    def __init__(self, matrix):
+        self.alphabet = matrix.alphabet
+        self.size = len(self.alphabet)
+        self.letters = matrix.index
+        self.encrypt_codes = self._build(matrix, 1)
+        self.decrypt_codes = self._build(matrix, -1)
+        # Only incomplete matrices have digraphs without a result
+        self.complete = UNDEFINED not in self.encrypt_codes
+        # Texts of larger alphabets are transformed pair by pair
+        self._index = _index_table(self.alphabet) if self.size < FOREIGN else None
+    
+    def _build(self, matrix, step: int) -> array:
+        """Apply the row/column/rectangle rules once to every digraph"""
+        codes = array('I', [UNDEFINED]) * (2 * self.size * self.size)
+        points, cells, rows, cols = matrix.index.codes, matrix.cells, matrix.rows, matrix.cols
+        
+        def char_code(row, col):
+            # Cells past the alphabet are the empty end of an incomplete last row
+            cell = row * cols + col
+            return points[cells[cell]] if cell < self.size else UNDEFINED
+        
+        for i in range(self.size):
+            row1, col1 = divmod(matrix.positions[i], cols)
+            for j in range(self.size):
+                row2, col2 = divmod(matrix.positions[j], cols)
+                
+                if row1 == row2:
+                    out1 = char_code(row1, (col1 + step) % cols)
+                    out2 = char_code(row2, (col2 + step) % cols)
+                elif col1 == col2:
+                    out1 = char_code((row1 + step) % rows, col1)
+                    out2 = char_code((row2 + step) % rows, col2)
+                else:
+                    out1 = char_code(row1, col2)
+                    out2 = char_code(row2, col1)
+                
+                if out1 != UNDEFINED and out2 != UNDEFINED:
+                    offset = 2 * (i * self.size + j)
+                    codes[offset] = out1
+                    codes[offset + 1] = out2
+        return codes
+    
+    def _transform(self, codes: array, indices: bytes, source) -> str:
+        """
+        Transform flat pairs of one-byte indices. Pairs with a FOREIGN index
+        stay unchanged: source() gives the original text of all the pairs.
+        """
+        letters = indices.translate(_CLAMP_TABLE)
+        if np is not None:
+            return self._transform_numpy(codes, indices, letters, source)
+        
+        words = memoryview(codes).cast('B').cast('Q')
+        pair_indices = map(add, map(self.size.__mul__, letters[0::2]), letters[1::2])
+        gathered = array('Q', list(map(words.__getitem__, pair_indices)))
+        
+        foreign = indices.find(FOREIGN)
+        if foreign >= 0:
+            originals = memoryview(source().encode(_PAIR_CODEC)).cast('Q')
+        while foreign >= 0:
+            pair = foreign // 2
+            gathered[pair] = originals[pair]
+            foreign = indices.find(FOREIGN, 2 * pair + 2)
+        
+        if not self.complete and UNDEFINED in gathered:
+            self._raise_undefined(indices, gathered.index(UNDEFINED))
+        return gathered.tobytes().decode(_PAIR_CODEC)
+    
+    def _transform_numpy(self, codes: array, indices: bytes, letters: bytes, source) -> str:
+        letters = np.frombuffer(letters, dtype=np.uint8).reshape(-1, 2)
+        pair_indices = letters[:, 0].astype(np.intp) * self.size + letters[:, 1]
+        gathered = np.frombuffer(codes, dtype=np.uint64)[pair_indices]
+        
+        foreign = (np.frombuffer(indices, dtype=np.uint8).reshape(-1, 2) == FOREIGN).any(axis=1)
+        if foreign.any():
+            originals = np.frombuffer(source().encode(_PAIR_CODEC), dtype=np.uint64)
+            gathered[foreign] = originals[foreign]
+        
+        if not self.complete:
+            undefined = np.flatnonzero(gathered == UNDEFINED)
+            if len(undefined):
+                self._raise_undefined(indices, int(undefined[0]))
+        return gathered.tobytes().decode(_PAIR_CODEC)
+    
+    def _raise_undefined(self, indices: bytes, pair: int):
+        offset = 2 * pair
+        pair = self.alphabet[indices[offset]] + self.alphabet[indices[offset + 1]]
+        raise ValueError(f"Digrama '{pair}' nu poate fi transformată în matricea incompletă!")
+    
+    def _transform_pair(self, codes: array, pair: str) -> str:
+        # Pairs with the separator, foreign characters or odd leftovers stay unchanged
+        if len(pair) == 2:
+            i, j = self.letters.index(pair[0]), self.letters.index(pair[1])
+            if i >= 0 and j >= 0:
+                offset = 2 * (i * self.size + j)
+                if codes[offset] == UNDEFINED:
+                    raise ValueError(f"Digrama '{pair}' nu poate fi transformată în matricea incompletă!")
+                return chr(codes[offset]) + chr(codes[offset + 1])
+        return pair
+    
+    def _transform_text(self, codes: array, text: str) -> str:
+        even = len(text) - len(text) % 2
+        if self._index is None:
+            return ''.join(self._transform_pair(codes, text[i:i+2]) for i in range(0, len(text), 2))
+        indices = text[:even].translate(self._index).encode("latin-1")
+        return self._transform(codes, indices, lambda: text[:even]) + text[even:]
+    
+    def encrypt_text(self, text: str) -> str:
+        """
+        Encrypt consecutive pairs of a text. Pairs with a character outside
+        the alphabet and an odd last character are kept as they are.
+        """
+        return self._transform_text(self.encrypt_codes, text)
+    
+    def decrypt_text(self, text: str) -> str:
+        """Decrypt consecutive pairs of a text, see encrypt_text"""
+        return self._transform_text(self.decrypt_codes, text)
+    
+    def encrypt_pairs(self, pairs) -> str:
+        """Encrypt prepared pairs"""
+        return self.encrypt_text(''.join(pairs))
+    
+    def decrypt_pairs(self, pairs) -> str:
+        """Decrypt pairs"""
+        return self.decrypt_text(''.join(pairs))
+    
+    def encrypt_pair(self, pair: str) -> str:
+        """Encrypt a single pair"""
+        return self._transform_pair(self.encrypt_codes, pair)
+    
+    def decrypt_pair(self, pair: str) -> str:
+        """Decrypt a single pair"""
+        return self._transform_pair(self.decrypt_codes, pair)
+    
+    def encrypt_coded(self, pairs: bytes, symbols: str) -> str:
+        """Encrypt flat pairs of one-byte symbol codes (see TextNormalizer.prepare)"""
+        # Symbol codes start with the alphabet indices; the separator and its substitute follow
+        indices = pairs.translate(_symbol_table(self.size))
+        return self._transform(self.encrypt_codes, indices,
+                               lambda: codecs.charmap_decode(pairs, "strict", _decoding_table(symbols))[0])
\ No newline at end of file
@@ -2,66 +2,243 @@
 Matrix management for Playfair cipher
 """
 
+import threading
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+
+from .digraph import DigraphTable
+
+# Digraph tables kept at once, 16 * N*N bytes each (~10 KB for 25 letters, ~1 MB for 250)
+DIGRAPH_CACHE_SIZE = 64
+
+
+def normalize_key(key: str, alphabet: str) -> str:
+    """Key letters that shape the matrix: uppercase, in alphabet, first occurrences only"""
+    normalized_key = ""
+    seen = set()
+    for char in key.upper():
+        if char not in seen and char in alphabet:
+            normalized_key += char
+            seen.add(char)
+    return normalized_key
+
+
+class AlphabetIndex:
+    """Code point <-> alphabet index arrays, shared by all matrices of one alphabet"""
+    
+    __slots__ = ("alphabet", "chars", "codes", "indices")
+    
+    def __init__(self, alphabet: str):
+        self.alphabet = alphabet
+        self.chars = tuple(alphabet)
+        self.codes = array('I', map(ord, alphabet))
+        self.indices = array('i', [-1]) * (max(self.codes, default=0) + 1)
+        for i, code in enumerate(self.codes):
+            self.indices[code] = i
+    
+    def index(self, char: str) -> int:
+        """Alphabet index of a character, -1 if it is not in the alphabet"""
+        code = ord(char)
+        return self.indices[code] if code < len(self.indices) else -1
+
+
+@lru_cache(maxsize=None)
+def alphabet_index(alphabet: str) -> AlphabetIndex:
+    return AlphabetIndex(alphabet)
+
+
+@lru_cache(maxsize=None)
+def cell_coordinates(rows: int, cols: int) -> tuple[tuple[int, int], ...]:
+    """(row, col) of every cell, shared by all matrices of one size"""
+    return tuple(divmod(cell, cols) for cell in range(rows * cols))
+
+
+class CompiledMatrix:
+    """
+    Immutable Playfair matrix built once for an (alphabet, key) pair.
+    
+    Stored as two flat integer arrays: the alphabet index of the letter in
+    each cell, row by row, and the cell of each alphabet index. Only the
+    first len(alphabet) cells hold letters; when the alphabet does not fill
+    the grid, the rest of the last row is empty.
+    """
+    
+    __slots__ = ("alphabet", "rows", "cols", "key", "size", "index", "cells", "positions",
+                 "_indices", "_chars", "_coordinates")
+    
+    def __init__(self, alphabet: str, rows: int, cols: int, key: str):
+        normalized_key = normalize_key(key, alphabet)
+        full_key = normalized_key + "".join(c for c in alphabet if c not in normalized_key)
+        index = alphabet_index(alphabet)
+        
+        cells = array('H' if len(alphabet) <= 0xFFFF else 'I', map(index.index, full_key))
+        positions = array(cells.typecode, bytes(cells.itemsize * len(alphabet)))
+        for cell, letter in enumerate(cells):
+            positions[letter] = cell
+        
+        set_attr = super().__setattr__
+        set_attr("alphabet", alphabet)
+        set_attr("rows", rows)
+        set_attr("cols", cols)
+        set_attr("key", normalized_key)
+        set_attr("size", len(alphabet))
+        set_attr("index", index)
+        set_attr("cells", cells)
+        set_attr("positions", positions)
+        # Shared lookup tables, referenced directly to keep lookups short
+        set_attr("_indices", index.indices)
+        set_attr("_chars", index.chars)
+        set_attr("_coordinates", cell_coordinates(rows, cols))
+    
+    @property
+    def digraphs(self) -> DigraphTable:
+        """Encryption/decryption tables of all digraphs, built on first use"""
+        return digraph_table(self)
+    
+    @property
+    def matrix(self) -> tuple[tuple[str, ...], ...]:
+        """Rows of characters, "" for the empty cells of an incomplete last row"""
+        letters = [self._chars[letter] for letter in self.cells]
+        letters += [""] * (self.rows * self.cols - self.size)
+        return tuple(tuple(letters[i:i + self.cols]) for i in range(0, len(letters), self.cols))
+    
+    @property
+    def char_positions(self) -> dict:
+        """Character -> (row, col)"""
+        return {self._chars[letter]: self._coordinates[cell]
+                for cell, letter in enumerate(self.cells)}
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledMatrix is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("CompiledMatrix is immutable")
+    
+    def get_position(self, char: str) -> tuple[int, int] | None:
+        """Get position of character in matrix"""
+        code = ord(char)
+        if code < len(self._indices):
+            letter = self._indices[code]
+            if letter >= 0:
+                return self._coordinates[self.positions[letter]]
+        return None
+    
+    def get_char_at_position(self, row: int, col: int) -> str | None:
+        """Get character at given position"""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            cell = row * self.cols + col
+            # Cells past the alphabet are the empty end of the last row
+            if cell < self.size:
+                return self._chars[self.cells[cell]]
+        return None
+
+
+@lru_cache(maxsize=DIGRAPH_CACHE_SIZE)
+def digraph_table(compiled: CompiledMatrix) -> DigraphTable:
+    """
+    Digraph table of a compiled matrix, in its own smaller LRU cache: at
+    16 * N*N bytes it would dwarf the MatrixCache entry of the matrix.
+    """
+    return DigraphTable(compiled)
+
+
+class MatrixCache:
+    """Bounded, thread-safe LRU cache of compiled matrices with hit/miss counters"""
+    
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, alphabet: str, rows: int, cols: int, key: str) -> CompiledMatrix:
+        """Compiled matrix for the key, built only on a cache miss"""
+        cache_key = (alphabet, rows, cols, normalize_key(key, alphabet))
+        with self._lock:
+            compiled = self._entries.get(cache_key)
+            if compiled is not None:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+        
+        compiled = CompiledMatrix(alphabet, rows, cols, cache_key[3])
+        with self._lock:
+            self._entries[cache_key] = compiled
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return compiled
+    
+    def info(self) -> dict:
+        """Cache statistics"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+    
+    def clear(self) -> None:
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by every PlayfairMatrix unless one is given explicitly
+MATRIX_CACHE = MatrixCache()
+
+
 class PlayfairMatrix:
     """Manages the Playfair cipher matrix"""
     
-    def __init__(self, alphabet: str, rows: int, cols: int):
+    __slots__ = ("alphabet", "rows", "cols", "cache", "compiled")
+    
+    def __init__(self, alphabet: str, rows: int, cols: int, cache: MatrixCache = None):
         self.alphabet = alphabet
         self.rows = rows
         self.cols = cols
-        self.matrix = []
-        self.char_positions = {}
+        self.cache = cache if cache is not None else MATRIX_CACHE
+        self.compiled = None
+    
+    @property
+    def matrix(self):
+        return self.compiled.matrix if self.compiled is not None else []
+    
+    @property
+    def char_positions(self) -> dict:
+        return self.compiled.char_positions if self.compiled is not None else {}
+    
+    def compile(self, key: str) -> CompiledMatrix:
+        """Get the immutable matrix for a key from the LRU cache"""
+        return self.cache.get(self.alphabet, self.rows, self.cols, key)
     
     def create_from_key(self, key: str) -> None:
         """Create matrix from key"""
-        # Normalize key - remove duplicates and convert to uppercase
-        normalized_key = ""
-        seen = set()
-        for char in key.upper():
-            if char not in seen and char in self.alphabet:
-                normalized_key += char
-                seen.add(char)
-        
-        # Add remaining alphabet letters
-        full_key = normalized_key
-        for char in self.alphabet:
-            if char not in seen:
-                full_key += char
-        
-        # Create matrix
-        self.matrix = []
-        self.char_positions = {}
-        
-        for i in range(self.rows):
-            row = []
-            for j in range(self.cols):
-                char_index = i * self.cols + j
-                if char_index < len(full_key):
-                    char = full_key[char_index]
-                    row.append(char)
-                    self.char_positions[char] = (i, j)
-                else:
-                    row.append("")  # Empty cell for incomplete matrix
-            self.matrix.append(row)
+        self.compiled = self.compile(key)
     
     def get_position(self, char: str) -> tuple[int, int] | None:
         """Get position of character in matrix"""
-        return self.char_positions.get(char)
+        return self.compiled.get_position(char) if self.compiled is not None else None
     
     def get_char_at_position(self, row: int, col: int) -> str | None:
         """Get character at given position"""
-        if 0 <= row < len(self.matrix) and 0 <= col < len(self.matrix[row]):
-            return self.matrix[row][col] if self.matrix[row][col] != "" else None
-        return None
+        return self.compiled.get_char_at_position(row, col) if self.compiled is not None else None
     
     def display(self) -> None:
         """Display the matrix"""
-        if not self.matrix:
+        matrix = self.matrix
+        if not matrix:
             print("Matricea nu a fost creată încă!")
             return
         
         print(f"Matricea Playfair ({self.rows}×{self.cols}, {len(self.alphabet)} litere):")
-        for i, row in enumerate(self.matrix):
+        for i, row in enumerate(matrix):
             formatted_row = []
             for cell in row:
                 formatted_row.append(cell if cell != "" else " ")
@@ -0,0 +1,114 @@
+"""
+Single-pass validation and normalization of texts for one alphabet
+"""
+
+import re
+
+from .validator import AlphabetValidator
+
+# Byte codes reserved by the compact form
+TERMINATOR = 0xFE
+INVALID = 0xFF
+MAX_SYMBOLS = TERMINATOR
+
+# A run of pairs of different letters, then the letter that needs a separator:
+# the first of two equal letters, the last letter of an odd text or the terminator
+_PAIRS_PATTERN = re.compile(rb'((?:([^\xfe])(?!\2)[^\xfe])*+)(.)', re.S)
+
+
+class TextNormalizer:
+    """
+    Validates and cleans texts for one alphabet with a single str.translate
+    call: letters of either case become one-byte symbol codes, whitespace is
+    dropped, the separator becomes its substitute and any other character
+    becomes the INVALID code.
+    
+    Codes are the alphabet indices, then the separator (N) and, when it is
+    not a letter of the alphabet, the separator substitute (N + 1). Texts
+    with characters outside Latin-1 that the table does not know (rare
+    Unicode whitespace or case mappings) take the AlphabetValidator and
+    TextPreprocessor route, so results never differ from it.
+    """
+    
+    def __init__(self, alphabet: str, separator: str):
+        self.alphabet = alphabet
+        self.separator = separator
+        self.validator = AlphabetValidator(alphabet, separator)
+        self.substitute = chr(ord(separator) - 1) if ord(separator) > ord('A') else 'V'
+        
+        self.symbols = alphabet + separator
+        if self.substitute not in alphabet:
+            self.symbols += self.substitute
+        self.compact = len(self.symbols) <= MAX_SYMBOLS
+        self.codes = {char: i for i, char in enumerate(self.symbols)}
+        self.separator_code = bytes([self.codes[separator]]) if self.compact else b""
+        
+        self._encode_table = self._build_table()
+        self._decode_table = {i: char for i, char in enumerate(self.symbols)}
+    
+    def _build_table(self) -> dict:
+        """Character -> code string (or None to drop it) for str.translate"""
+        clean = {char: chr(self.codes[char]) for char in self.alphabet}
+        clean[self.separator] = chr(self.codes[self.substitute])
+        
+        table = {}
+        # Every Latin-1 character is mapped, so leftovers after translate are never valid
+        for code in range(256):
+            char = chr(code)
+            upper = char.upper()
+            if char.isspace():
+                table[code] = None
+            elif all(c in clean for c in upper):
+                table[code] = "".join(clean[c] for c in upper)
+            else:
+                table[code] = chr(INVALID)
+        for char in self.alphabet + self.separator:
+            for variant in {char, char.lower()}:
+                if len(variant) == 1 and variant.upper() == char:
+                    table[ord(variant)] = clean[char]
+        return table
+    
+    def validate(self, text: str) -> None:
+        """validate_text in one pass: only alphabet letters, the separator and whitespace"""
+        if not self.compact:
+            self.validator.validate_text(text)
+            return
+        try:
+            coded = text.translate(self._encode_table).encode("latin-1")
+        except UnicodeEncodeError:
+            coded = None
+        if coded is None or INVALID in coded:
+            # Let the original validator report the offending character
+            self.validator.validate_text(text)
+    
+    def encode(self, text: str) -> bytes:
+        """
+        Validate and clean a plaintext in one pass. Returns one code per
+        letter, as TextPreprocessor.clean_text would leave it. Compact
+        alphabets only (at most MAX_SYMBOLS symbols).
+        """
+        try:
+            coded = text.translate(self._encode_table).encode("latin-1")
+        except UnicodeEncodeError:
+            coded = None
+        if coded is not None and INVALID not in coded:
+            return coded
+        
+        self.validator.validate_text(text)
+        clean_text = ''.join(text.upper().split())
+        clean_text = clean_text.replace(self.separator, self.substitute)
+        return bytes(self.codes[char] for char in clean_text)
+    
+    def decode(self, codes: bytes) -> str:
+        return codes.decode("latin-1").translate(self._decode_table)
+    
+    def prepare(self, codes: bytes) -> bytes:
+        """
+        TextPreprocessor.prepare_text on codes: a separator after the first of
+        two equal letters in a pair and after an odd last letter. The pairs
+        are returned flat, two bytes each.
+        """
+        # Named group references, so a separator code that is an ASCII digit
+        # is not read as part of the group number
+        template = rb"\g<1>\g<3>" + self.separator_code.replace(b"\\", b"\\\\")
+        return _PAIRS_PATTERN.sub(template, codes + bytes([TERMINATOR]))[:-2]
\ No newline at end of file
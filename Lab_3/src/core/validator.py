@@ -8,6 +8,7 @@ class AlphabetValidator:
     def __init__(self, alphabet: str, separator: str):
         self.alphabet = alphabet
         self.separator = separator
+        self.valid_chars = frozenset(alphabet + separator)
     
     def validate_key(self, key: str) -> None:
         """Validate encryption key"""
@@ -15,11 +16,11 @@ class AlphabetValidator:
             raise ValueError("Cheia trebuie să aibă cel puțin 7 caractere!")
         
         for char in "".join(key.split()).upper():
-            if char not in self.alphabet and char != self.separator:
+            if char not in self.valid_chars:
                 raise ValueError(f"Caracterul '{char}' nu este valid! Folosiți doar litere din alfabetul specificat.")
     
     def validate_text(self, text: str) -> None:
         """Validate input text"""
         for char in  "".join(text.split()).upper():
-            if char != ' ' and char not in self.alphabet and char != self.separator:
+            if char != ' ' and char not in self.valid_chars:
                 raise ValueError(f"Caracterul '{char}' nu este valid! Folosiți doar litere din alfabetul specificat.")
\ No newline at end of file
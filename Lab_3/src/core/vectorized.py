@@ -0,0 +1,114 @@
+"""
+NumPy implementation of the Playfair text transformation
+"""
+
+import numpy as np
+
+from .matrix import CompiledMatrix
+
+
+def to_codes(text: str) -> np.ndarray:
+    """Code points of a string as a uint32 array"""
+    return np.frombuffer(text.encode("utf-32-le"), dtype="<u4")
+
+
+def from_codes(codes: np.ndarray) -> str:
+    """Inverse of to_codes"""
+    return codes.astype("<u4", copy=False).tobytes().decode("utf-32-le")
+
+
+def insert_separators(codes: np.ndarray, separator: int) -> np.ndarray:
+    """
+    Vectorized form of TextPreprocessor.prepare_text pairing: a separator goes
+    after a letter that starts a pair and equals the next letter, and one more
+    pads an odd result. The flattened pairs are returned.
+    
+    Walking the text left to right, the last letter of every run of two or
+    more identical letters always ends up first in its pair. Every letter of
+    such a run but the last one therefore gets a separator, except the first
+    one when it is second in a pair - which only depends on the distance to
+    the end of the previous run.
+    """
+    equal = codes[1:] == codes[:-1]
+    after_equal = np.r_[False, equal[:-1]]
+    run_starts = np.flatnonzero(equal & ~after_equal)
+    run_ends = np.flatnonzero(after_equal & ~equal)
+    
+    # Letters between two runs alternate between first and second in a pair
+    previous_end = np.r_[-2, run_ends][:len(run_starts)]
+    second_in_pair = run_starts[(run_starts - previous_end) % 2 == 1]
+    equal[second_in_pair] = False
+    
+    out = np.insert(codes, np.flatnonzero(equal) + 1, separator)
+    if len(out) % 2:
+        out = np.r_[out, np.array([separator], dtype=out.dtype)]
+    return out
+
+
+class VectorizedCryptographer:
+    """Applies the Playfair rules to whole texts with array arithmetic"""
+    
+    def __init__(self, separator: str):
+        self.separator = separator
+    
+    @staticmethod
+    def _layout(matrix: CompiledMatrix):
+        """Code point -> (row, col) lookup arrays and the grid as code points"""
+        points = np.array(matrix.index.codes, dtype=np.int64)
+        positions = np.array(matrix.positions, dtype=np.int64)
+        rows = np.full(points.max() + 2, -1, dtype=np.int32)
+        cols = np.full(points.max() + 2, -1, dtype=np.int32)
+        rows[points], cols[points] = np.divmod(positions, matrix.cols)
+        grid = np.zeros(matrix.rows * matrix.cols, dtype=np.uint32)
+        grid[positions] = points
+        return rows, cols, grid
+    
+    def transform(self, flat: np.ndarray, matrix: CompiledMatrix, step: int) -> np.ndarray:
+        """
+        Encrypt (step=1) or decrypt (step=-1) a flat array of pairs. Pairs with
+        the separator or characters outside the matrix stay unchanged.
+        """
+        row_of, col_of, grid = self._layout(matrix)
+        # Every code point past the alphabet maps to the last (-1) entry
+        clipped = np.minimum(flat, len(row_of) - 1)
+        rows, cols = row_of[clipped], col_of[clipped]
+        r1, r2 = rows[0::2], rows[1::2]
+        c1, c2 = cols[0::2], cols[1::2]
+        
+        valid = (r1 >= 0) & (r2 >= 0)
+        r1, r2, c1, c2 = r1[valid], r2[valid], c1[valid], c2[valid]
+        same_row = r1 == r2
+        same_col = (c1 == c2) & ~same_row
+        
+        # Rectangle: swap the columns; same row/column: shift along it
+        new_c1 = np.where(same_row, (c1 + step) % matrix.cols, np.where(same_col, c1, c2))
+        new_c2 = np.where(same_row, (c2 + step) % matrix.cols, np.where(same_col, c2, c1))
+        new_r1 = np.where(same_col, (r1 + step) % matrix.rows, r1)
+        new_r2 = np.where(same_col, (r2 + step) % matrix.rows, r2)
+        
+        out1 = grid[new_r1 * matrix.cols + new_c1]
+        out2 = grid[new_r2 * matrix.cols + new_c2]
+        if not (out1.all() and out2.all()):
+            bad = np.flatnonzero(valid)[np.flatnonzero((out1 == 0) | (out2 == 0))[0]]
+            pair = chr(flat[2 * bad]) + chr(flat[2 * bad + 1])
+            raise ValueError(f"Digrama '{pair}' nu poate fi transformată în matricea incompletă!")
+        
+        result = flat.copy()
+        result[0::2][valid] = out1
+        result[1::2][valid] = out2
+        return result
+    
+    def encrypt_text(self, clean_text: str, matrix: CompiledMatrix) -> str:
+        """Encrypt cleaned text (TextPreprocessor.clean_text output)"""
+        return self.encrypt_codes(to_codes(clean_text), matrix)
+    
+    def encrypt_codes(self, codes: np.ndarray, matrix: CompiledMatrix) -> str:
+        """Encrypt the code points of a cleaned text"""
+        flat = insert_separators(codes, ord(self.separator))
+        return from_codes(self.transform(flat, matrix, 1))
+    
+    def decrypt_text(self, ciphertext: str, matrix: CompiledMatrix) -> str:
+        """Decrypt ciphertext pairs, an odd last character is kept as is"""
+        codes = to_codes(ciphertext)
+        even = len(codes) - len(codes) % 2
+        return from_codes(self.transform(codes[:even], matrix, -1)) + ciphertext[even:]
\ No newline at end of file
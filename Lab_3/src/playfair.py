@@ -2,12 +2,21 @@
 Main Playfair cipher facade that coordinates all components
 """
 
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 from .core.validator import AlphabetValidator
-from .core.matrix import PlayfairMatrix
+from .core.matrix import CompiledMatrix, PlayfairMatrix
+from .core.normalizer import TextNormalizer
 from .core.cryptographer import PlayfairCryptographer
 from .utils.helpers import MatrixDimensionCalculator, TextPreprocessor
 from .alphabet.config import AlphabetConfig
 
+# Characters read per chunk by encrypt_stream/decrypt_stream
+STREAM_CHUNK_SIZE = 1 << 16
+
+# Items sent to a worker process at a time by the batch methods
+BATCH_CHUNK_SIZE = 64
+
 class PlayfairCipher:
     """Main Playfair cipher facade - coordinates all components"""
     
@@ -19,47 +28,118 @@ class PlayfairCipher:
         self.config = alphabet_config
         self.validator = AlphabetValidator(self.config.alphabet, self.config.separator)
         self.preprocessor = TextPreprocessor(self.config.separator)
+        self.normalizer = TextNormalizer(self.config.alphabet, self.config.separator)
         
         # Calculate matrix dimensions
         rows, cols = MatrixDimensionCalculator.calculate(len(self.config.alphabet))
         self.matrix = PlayfairMatrix(self.config.alphabet, rows, cols)
         self.cryptographer = PlayfairCryptographer(self.matrix, self.config.separator)
     
+    def compile_key(self, key: str) -> CompiledMatrix:
+        """Validate the key and get its immutable matrix from the shared cache"""
+        self.validator.validate_key(key)
+        return self.matrix.compile(key)
+    
     def encrypt(self, plaintext: str, key: str) -> str:
         """Encrypt plaintext using Playfair cipher"""
-        self.validator.validate_text(plaintext)
-        self.validator.validate_key(key)
+        if not self.normalizer.compact:
+            self.validator.validate_text(plaintext)
+            compiled = self.compile_key(key)
+            return compiled.digraphs.encrypt_pairs(self.preprocessor.prepare_text(plaintext))
         
-        self.matrix.create_from_key(key)
-        pairs = self.preprocessor.prepare_text(plaintext)
-        
-        encrypted_pairs = []
-        for pair in pairs:
-            encrypted_pairs.append(self.cryptographer.encrypt_pair(pair))
-        
-        return ''.join(encrypted_pairs)
+        # Validation and cleaning in one pass, then one lookup per pair code
+        codes = self.normalizer.encode(plaintext)
+        compiled = self.compile_key(key)
+        pairs = self.normalizer.prepare(codes)
+        return compiled.digraphs.encrypt_coded(pairs, self.normalizer.symbols)
     
     def decrypt(self, ciphertext: str, key: str) -> str:
         """Decrypt ciphertext using Playfair cipher"""
-        self.validator.validate_text(ciphertext)
-        self.validator.validate_key(key)
+        self.normalizer.validate(ciphertext)
+        compiled = self.compile_key(key)
         
-        self.matrix.create_from_key(key)
+        # Consecutive pairs of the ciphertext (an odd last character is kept as is)
+        return compiled.digraphs.decrypt_text(ciphertext)
+    
+    def encrypt_batch(self, items, workers: int = None, processes: bool = False) -> list[str]:
+        """
+        Encrypt (key, text) pairs concurrently, results in input order.
+        Threads share this instance; processes each build their own cipher.
+        """
+        return self._run_batch("encrypt", items, workers, processes)
+    
+    def decrypt_batch(self, items, workers: int = None, processes: bool = False) -> list[str]:
+        """Decrypt (key, text) pairs concurrently, results in input order"""
+        return self._run_batch("decrypt", items, workers, processes)
+    
+    def _run_batch(self, operation: str, items, workers: int, processes: bool) -> list[str]:
+        items = list(items)
+        keys, texts = zip(*items) if items else ((), ())
+        if processes:
+            with ProcessPoolExecutor(workers, initializer=_init_batch_worker,
+                                     initargs=(type(self), self.config)) as pool:
+                return list(pool.map(_run_batch_item, [operation] * len(keys), texts, keys,
+                                     chunksize=BATCH_CHUNK_SIZE))
+        with ThreadPoolExecutor(workers) as pool:
+            return list(pool.map(getattr(self, operation), texts, keys))
+    
+    def encrypt_stream(self, src, dst, key: str, chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+        """
+        Encrypt text read from file object src into dst, chunk by chunk.
+        Memory use is bounded by chunk_size whatever the input size.
+        Returns the number of characters written.
+        """
+        digraphs = self.compile_key(key).digraphs
         
-        # Split ciphertext into pairs
-        pairs = [ciphertext[i:i+2] for i in range(0, len(ciphertext), 2)]
-        decrypted_pairs = []
+        written = 0
+        if not self.normalizer.compact:
+            for pairs in self.preprocessor.prepare_chunks(self._read_chunks(src, chunk_size)):
+                written += dst.write(digraphs.encrypt_pairs(pairs))
+            return written
         
-        for pair in pairs:
-            if len(pair) == 2:
-                decrypted_pairs.append(self.cryptographer.decrypt_pair(pair))
-            else:
-                decrypted_pairs.append(pair)  # Handle odd length
+        symbols = self.normalizer.symbols
+        separator = self.normalizer.separator_code
+        pending = b""
+        for chunk in iter(lambda: src.read(chunk_size), ""):
+            codes = pending + self.normalizer.encode(chunk)
+            pairs = self.normalizer.prepare(codes)
+            # A last pair ending in the separator pads the last letter, whose
+            # real partner may be at the start of the next chunk
+            pending = b""
+            if pairs.endswith(separator):
+                pending, pairs = codes[-1:], pairs[:-2]
+            written += dst.write(digraphs.encrypt_coded(pairs, symbols))
+        if pending:
+            written += dst.write(digraphs.encrypt_coded(self.normalizer.prepare(pending), symbols))
+        return written
+    
+    def decrypt_stream(self, src, dst, key: str, chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+        """Decrypt text read from file object src into dst, chunk by chunk"""
+        digraphs = self.compile_key(key).digraphs
         
-        return ''.join(decrypted_pairs)
+        written = 0
+        pending = ""
+        for chunk in self._read_chunks(src, chunk_size):
+            # A pair split between two chunks is completed with the next one
+            text = pending + chunk
+            even = len(text) - len(text) % 2
+            pending = text[even:]
+            written += dst.write(digraphs.decrypt_text(text[:even]))
+        if pending:
+            written += dst.write(digraphs.decrypt_text(pending))
+        return written
+    
+    def _read_chunks(self, src, chunk_size: int):
+        """Validated chunks of a text file object"""
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                return
+            self.normalizer.validate(chunk)
+            yield chunk
     
     def create_matrix(self, key: str) -> None:
-        """Create matrix for display purposes"""
+        """Create matrix for display purposes (the only method that changes self.matrix)"""
         self.validator.validate_key(key)
         self.matrix.create_from_key(key)
     
@@ -73,6 +153,23 @@ class PlayfairCipher:
         """Get information about the alphabet and separator"""
         return self.config.get_info()
     
+    def get_cache_info(self) -> dict:
+        """Get hit/miss counters of the compiled matrix cache"""
+        return self.matrix.cache.info()
+    
     def prepare_text(self, text: str) -> list[str]:
         """Expose text preparation for demonstration purposes"""
-        return self.preprocessor.prepare_text(text)
\ No newline at end of file
+        return self.preprocessor.prepare_text(text)
+
+
+# Cipher of a batch worker process, set once by _init_batch_worker
+_batch_cipher = None
+
+
+def _init_batch_worker(cipher_class, config: AlphabetConfig) -> None:
+    global _batch_cipher
+    _batch_cipher = cipher_class(config)
+
+
+def _run_batch_item(operation: str, text: str, key: str) -> str:
+    return getattr(_batch_cipher, operation)(text, key)
\ No newline at end of file
@@ -0,0 +1,36 @@
+"""
+Playfair cipher facade backed by the NumPy whole-text engine
+"""
+
+import numpy as np
+
+from .playfair import PlayfairCipher
+from .core.vectorized import VectorizedCryptographer, to_codes
+
+class VectorizedPlayfairCipher(PlayfairCipher):
+    """Same results as PlayfairCipher, computed with array operations over the whole text"""
+    
+    def __init__(self, alphabet_config=None):
+        super().__init__(alphabet_config)
+        self.vectorized = VectorizedCryptographer(self.config.separator)
+        # Code point of each TextNormalizer symbol code
+        self.symbol_points = to_codes(self.normalizer.symbols)
+    
+    def encrypt(self, plaintext: str, key: str) -> str:
+        """Encrypt plaintext using Playfair cipher"""
+        if not self.normalizer.compact:
+            self.validator.validate_text(plaintext)
+            compiled = self.compile_key(key)
+            clean_text = self.preprocessor.clean_text(plaintext)
+            return self.vectorized.encrypt_text(clean_text, compiled)
+        
+        codes = self.normalizer.encode(plaintext)
+        compiled = self.compile_key(key)
+        points = self.symbol_points[np.frombuffer(codes, dtype=np.uint8)]
+        return self.vectorized.encrypt_codes(points, compiled)
+    
+    def decrypt(self, ciphertext: str, key: str) -> str:
+        """Decrypt ciphertext using Playfair cipher"""
+        self.normalizer.validate(ciphertext)
+        compiled = self.compile_key(key)
+        return self.vectorized.decrypt_text(ciphertext, compiled)
\ No newline at end of file
@@ -156,8 +156,9 @@ class PlayfairUI:
             show_matrix = input("\nDoriți să vedeți matricea folosită? (d/n): ").lower()
             if show_matrix in ['d', 'da', 'y', 'yes']:
                 print()
+                self.cipher.create_matrix(key)
                 self.cipher.display_matrix()
-                
+        
         except Exception as e:
             print(f"Eroare la criptare: {e}")
     
@@ -177,8 +178,9 @@ class PlayfairUI:
             show_matrix = input("\nDoriți să vedeți matricea folosită? (d/n): ").lower()
             if show_matrix in ['d', 'da', 'y', 'yes']:
                 print()
+                self.cipher.create_matrix(key)
                 self.cipher.display_matrix()
-                
+        
         except Exception as e:
             print(f"Eroare la decriptare: {e}")
     
@@ -3,6 +3,7 @@ Utility functions for Playfair cipher
 """
 
 import math
+from typing import Iterable, Iterator
 
 class MatrixDimensionCalculator:
     """Calculates optimal matrix dimensions for different alphabet sizes"""
@@ -30,8 +31,8 @@ class TextPreprocessor:
     def __init__(self, separator: str):
         self.separator = separator
     
-    def prepare_text(self, text: str) -> list[str]:
-        """Prepare text for encryption/decryption"""
+    def clean_text(self, text: str) -> str:
+        """Uppercase text without spaces, the separator replaced by a substitute letter"""
         # Remove spaces and convert to uppercase
         clean_text = ''.join(text.upper().split())
         
@@ -39,22 +40,46 @@ class TextPreprocessor:
         if self.separator in clean_text:
             substitute = chr(ord(self.separator) - 1) if ord(self.separator) > ord('A') else 'V'
             clean_text = clean_text.replace(self.separator, substitute)
-        
-        # Split into pairs
+        return clean_text
+    
+    def _split_pairs(self, clean_text: str) -> tuple[list[str], str]:
+        """Pairs of clean text and the trailing letter that still needs a partner"""
         pairs = []
         i = 0
-        while i < len(clean_text):
-            if i + 1 < len(clean_text):
-                if clean_text[i] == clean_text[i + 1]:
-                    # Insert separator between identical letters
-                    pairs.append(clean_text[i] + self.separator)
-                    i += 1
-                else:
-                    pairs.append(clean_text[i] + clean_text[i + 1])
-                    i += 2
-            else:
-                # Add separator for odd length
+        while i + 1 < len(clean_text):
+            if clean_text[i] == clean_text[i + 1]:
+                # Insert separator between identical letters
                 pairs.append(clean_text[i] + self.separator)
                 i += 1
-        
-        return pairs
\ No newline at end of file
+            else:
+                pairs.append(clean_text[i] + clean_text[i + 1])
+                i += 2
+        return pairs, clean_text[i:]
+    
+    def prepare_text(self, text: str) -> list[str]:
+        """Prepare text for encryption/decryption"""
+        pairs, pending = self._split_pairs(self.clean_text(text))
+        if pending:
+            # Add separator for odd length
+            pairs.append(pending + self.separator)
+        return pairs
+    
+    def prepare_chunks(self, chunks: Iterable[str]) -> Iterator[list[str]]:
+        """
+        prepare_text over a sequence of text chunks: yields the pairs of each
+        chunk as soon as they are known. A letter whose partner may be in the
+        next chunk is carried over, so the result equals prepare_text of the
+        concatenated chunks.
+        """
+        pending = ""
+        for chunk in chunks:
+            pairs, pending = self._split_pairs(pending + self.clean_text(chunk))
+            if pairs:
+                yield pairs
+        if pending:
+            yield [pending + self.separator]
+    
+    def iter_pairs(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Digraphs of a chunked text, one at a time"""
+        for pairs in self.prepare_chunks(chunks):
+            yield from pairs
\ No newline at end of file
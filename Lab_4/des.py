@@ -0,0 +1,167 @@
+"""
+DES block encryption on 64-bit integers, built on the key schedule.
+
+The Feistel function uses combined SP tables: for each S-box, the
+64 possible 6-bit inputs are mapped straight to the 32-bit word after
+the S-box lookup and the P permutation. One round is then 8 table
+lookups OR-ed together. The expansion E needs no table, because chunk i
+of E(R) is bits 4i..4i+5 of R extended by one bit at each end.
+"""
+
+import argparse
+import time
+from functools import lru_cache
+
+from des_tables import IP, FP, P, S_BOXES
+from des_utils import byte_tables, permute_int
+from key_schedule import get_key_schedule, PARITY_MASK, SCHEDULE_CACHE_SIZE
+
+MASK_32 = 0xFFFFFFFF
+
+# Standard known-answer vectors: (key, plaintext, ciphertext)
+KNOWN_ANSWERS = [
+    (0x133457799BBCDFF1, 0x0123456789ABCDEF, 0x85E813540F0AB405),
+    (0x0E329232EA6D0D73, 0x8787878787878787, 0x0000000000000000),
+    (0x0101010101010101, 0x8000000000000000, 0x95F8A5E5DD31D900),
+    (0x8001010101010101, 0x0000000000000000, 0x95A8D72813DAA94D),
+    (0x7CA110454A1A6E57, 0x01A1D6D039776742, 0x690F5B0D9A26939B),
+    (0x0131D9619DC1376E, 0x5CD54CA83DEF57DA, 0x7A389D10354BD271),
+]
+
+
+def build_sp_tables():
+    """S-box i followed by P, for every 6-bit input: eight 64-entry tables"""
+    p_tables = byte_tables(P, 32)
+    sp_tables = []
+    for i, box in enumerate(S_BOXES):
+        table = []
+        for chunk in range(64):
+            # Outer bits select the row, inner bits the column
+            row = (chunk >> 4 & 2) | (chunk & 1)
+            col = chunk >> 1 & 0xF
+            table.append(permute_int(box[row][col] << (28 - 4 * i), p_tables))
+        sp_tables.append(tuple(table))
+    return tuple(sp_tables)
+
+
+IP_TABLES = byte_tables(IP, 64)
+FP_TABLES = byte_tables(FP, 64)
+SP_TABLES = build_sp_tables()
+
+# Unpacked so the block function indexes them without a loop
+IP0, IP1, IP2, IP3, IP4, IP5, IP6, IP7 = IP_TABLES
+FP0, FP1, FP2, FP3, FP4, FP5, FP6, FP7 = FP_TABLES
+SP0, SP1, SP2, SP3, SP4, SP5, SP6, SP7 = SP_TABLES
+
+
+def split_round_key(Ki):
+    """48-bit round key as the eight 6-bit values XOR-ed into the S-box inputs"""
+    return tuple(Ki >> (42 - 6 * i) & 0x3F for i in range(8))
+
+
+@lru_cache(maxsize=SCHEDULE_CACHE_SIZE)
+def _cached_subkeys(key, decrypt):
+    schedule = get_key_schedule(key)
+    if decrypt:
+        schedule = schedule[::-1]
+    return tuple(split_round_key(Ki) for Ki in schedule)
+
+
+def get_subkeys(key, decrypt=False):
+    """
+    Round keys of a 64-bit key in the form des_block uses, cached.
+    Decryption is the same rounds with the keys in reverse order.
+    """
+    return _cached_subkeys(key & ~PARITY_MASK, decrypt)
+
+
+def des_block(block, subkeys):
+    """Encrypt or decrypt one 64-bit block with subkeys from get_subkeys"""
+    x = (IP0[block >> 56] | IP1[block >> 48 & 0xFF] | IP2[block >> 40 & 0xFF]
+         | IP3[block >> 32 & 0xFF] | IP4[block >> 24 & 0xFF] | IP5[block >> 16 & 0xFF]
+         | IP6[block >> 8 & 0xFF] | IP7[block & 0xFF])
+    L, R = x >> 32, x & MASK_32
+
+    for k0, k1, k2, k3, k4, k5, k6, k7 in subkeys:
+        # 34 bits: bit 32 of R, R itself, bit 1 of R - chunk i of E(R) starts at bit 4i
+        r = (R & 1) << 33 | R << 1 | R >> 31
+        L, R = R, L ^ (SP0[r >> 28 ^ k0] | SP1[(r >> 24 ^ k1) & 0x3F]
+                       | SP2[(r >> 20 ^ k2) & 0x3F] | SP3[(r >> 16 ^ k3) & 0x3F]
+                       | SP4[(r >> 12 ^ k4) & 0x3F] | SP5[(r >> 8 ^ k5) & 0x3F]
+                       | SP6[(r >> 4 ^ k6) & 0x3F] | SP7[(r ^ k7) & 0x3F])
+
+    # The halves are not swapped after the last round
+    x = R << 32 | L
+    return (FP0[x >> 56] | FP1[x >> 48 & 0xFF] | FP2[x >> 40 & 0xFF]
+            | FP3[x >> 32 & 0xFF] | FP4[x >> 24 & 0xFF] | FP5[x >> 16 & 0xFF]
+            | FP6[x >> 8 & 0xFF] | FP7[x & 0xFF])
+
+
+def encrypt_block(block, key):
+    """Encrypt a 64-bit integer block with a 64-bit integer key"""
+    return des_block(block, get_subkeys(key))
+
+
+def decrypt_block(block, key):
+    """Decrypt a 64-bit integer block with a 64-bit integer key"""
+    return des_block(block, get_subkeys(key, decrypt=True))
+
+
+def self_test():
+    """Check the engine against KNOWN_ANSWERS, returns the failing vectors"""
+    failures = []
+    for key, plaintext, ciphertext in KNOWN_ANSWERS:
+        if (encrypt_block(plaintext, key) != ciphertext
+                or decrypt_block(ciphertext, key) != plaintext):
+            failures.append((key, plaintext, ciphertext))
+    return failures
+
+
+def benchmark(blocks=100000, key=0x133457799BBCDFF1):
+    """Encrypt blocks chained blocks under one key, returns blocks per second"""
+    subkeys = get_subkeys(key)
+    block = 0
+    start = time.perf_counter()
+    for _ in range(blocks):
+        block = des_block(block, subkeys)
+    return blocks / (time.perf_counter() - start)
+
+
+def parse_hex64(s):
+    """argparse type for a 64-bit value given as 16 hex digits"""
+    try:
+        value = int(s, 16)
+    except ValueError:
+        value = -1
+    if len(s) != 16 or value < 0:
+        raise argparse.ArgumentTypeError("expected 16 hex digits (64 bits)")
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DES block encryption.")
+    parser.add_argument("operation", choices=("encrypt", "decrypt", "test", "benchmark"))
+    parser.add_argument("-k", "--key", type=parse_hex64, help="64-bit key in hex")
+    parser.add_argument("-b", "--block", type=parse_hex64, help="64-bit block in hex")
+    parser.add_argument("-n", "--blocks", type=int, default=100000,
+                        help="blocks to encrypt for the benchmark")
+    args = parser.parse_args(argv)
+
+    if args.operation == "test":
+        failures = self_test()
+        for key, plaintext, ciphertext in failures:
+            print(f"FAIL key={key:016X} plaintext={plaintext:016X} ciphertext={ciphertext:016X}")
+        print(f"{len(KNOWN_ANSWERS) - len(failures)}/{len(KNOWN_ANSWERS)} known-answer tests passed")
+        parser.exit(1 if failures else 0)
+    if args.operation == "benchmark":
+        print(f"{benchmark(args.blocks):,.0f} blocks/s")
+        return
+
+    if args.key is None or args.block is None:
+        parser.error("encrypt/decrypt need --key and --block")
+    crypt = encrypt_block if args.operation == "encrypt" else decrypt_block
+    print(f"{crypt(args.block, args.key):016X}")
+
+
+if __name__ == "__main__":
+    main()
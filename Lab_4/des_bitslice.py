@@ -0,0 +1,208 @@
+"""
+Bitsliced DES in NumPy: many independent (key, block) instances at once.
+
+Every bit position of the cipher state is one uint64 array, and each of
+its words holds that bit for 64 instances (lane j is bit j % 64 of word
+j // 64). A permutation (IP, E, P, PC-1, PC-2, the key rotations) is then
+only a reordering of rows, and XOR with the round key is one array XOR.
+
+The S-boxes are boolean-gate networks derived from des_tables.S_BOXES.
+Each output bit is split into multiplexers on one input bit at a time,
+f = f0 ^ (x & (f0 ^ f1)), and identical sub-functions are shared. The
+gates of one level of all eight S-boxes are evaluated together with a
+few array operations.
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from des import encrypt_block, decrypt_block
+from des_tables import IP, FP, E, P, PC1, PC2, S_BOXES
+from key_schedule import CUMULATIVE_SHIFTS
+
+LANES = 64
+ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def round_key_map():
+    """
+    For every round, the key bit (0-based, of the 64-bit key) behind each
+    of the 48 round key bits: PC-1, the cumulative rotation and PC-2 in one.
+    """
+    rounds = []
+    for shifts in CUMULATIVE_SHIFTS:
+        C = [PC1[(i + shifts) % 28] for i in range(28)]
+        D = [PC1[28 + (i + shifts) % 28] for i in range(28)]
+        CD = C + D
+        rounds.append([CD[j - 1] - 1 for j in PC2])
+    return np.array(rounds, dtype=np.intp)
+
+
+def sbox_truth_table(box, out_bit):
+    """Output bit out_bit (0 = most significant) of an S-box for all 64 inputs"""
+    return tuple(box[(v >> 4 & 2) | (v & 1)][v >> 1 & 0xF] >> (3 - out_bit) & 1
+                 for v in range(64))
+
+
+def compile_sboxes():
+    """
+    Multiplexer networks of the eight S-boxes, level by level from the
+    constants up. Level k holds the distinct functions of the last k input
+    bits; each is mux(x, f0, f1) of two level k-1 functions, where x is
+    S-box input bit 6 - k.
+
+    Returns (levels, outputs): for each level the (f0, f1, x) index arrays
+    of its gates - f0/f1 into the previous level, x into the 48 S-box input
+    rows - and the 32 level-6 indices of the S-box outputs in order.
+    """
+    # Level 0: the constants 0 and 1, shared by all S-boxes
+    nodes = {(0,): 0, (1,): 1}
+    tops = [sbox_truth_table(box, o) for box in S_BOXES for o in range(4)]
+    levels = []
+    # Functions at each level, per S-box, found from the outputs down
+    per_level = [[{t for t in tops[4 * s:4 * s + 4]} for s in range(8)]]
+    for _ in range(6):
+        per_level.append([{half for t in funcs for half in (t[:len(t) // 2], t[len(t) // 2:])}
+                          for funcs in per_level[-1]])
+    per_level.reverse()
+
+    for k in range(1, 7):
+        index, f0, f1, x = {}, [], [], []
+        for s, funcs in enumerate(per_level[k]):
+            for t in sorted(funcs):
+                h = len(t) // 2
+                index[s, t] = len(f0)
+                # The first half of a truth table is the function with bit 6 - k = 0
+                f0.append(nodes[t[:h]] if k == 1 else nodes[s, t[:h]])
+                f1.append(nodes[t[h:]] if k == 1 else nodes[s, t[h:]])
+                x.append(6 * s + 6 - k)
+        levels.append(tuple(np.array(a, dtype=np.intp) for a in (f0, f1, x)))
+        nodes = index
+    outputs = np.array([nodes[s, tops[4 * s + o]] for s in range(8) for o in range(4)],
+                       dtype=np.intp)
+    return levels, outputs
+
+
+KEY_MAP = round_key_map()
+SBOX_LEVELS, SBOX_OUTPUTS = compile_sboxes()
+IP_ROWS = np.array(IP, dtype=np.intp) - 1
+FP_ROWS = np.array(FP, dtype=np.intp) - 1
+E_ROWS = np.array(E, dtype=np.intp) - 1
+P_ROWS = np.array(P, dtype=np.intp) - 1
+
+
+def to_slices(values):
+    """uint64 values (length a multiple of 64) -> (64, n / 64) bit rows, bit 1 first"""
+    big_endian = values.astype('>u8').view(np.uint8).reshape(-1, 8)
+    bits = np.unpackbits(big_endian, axis=1)
+    return np.packbits(np.ascontiguousarray(bits.T), axis=1, bitorder='little').view('<u8')
+
+
+def from_slices(rows):
+    """Inverse of to_slices"""
+    bits = np.unpackbits(np.ascontiguousarray(rows).view(np.uint8), axis=1, bitorder='little')
+    return np.packbits(np.ascontiguousarray(bits.T), axis=1).view('>u8').ravel().astype(np.uint64)
+
+
+def sbox_layer(x):
+    """The eight S-boxes on 48 sliced input rows, returns the 32 output rows"""
+    prev = np.stack([np.zeros_like(x[0]), np.full_like(x[0], ALL_ONES)])
+    for f0, f1, sel in SBOX_LEVELS:
+        a, b = prev[f0], prev[f1]
+        prev = a ^ (x[sel] & (a ^ b))
+    return prev[SBOX_OUTPUTS]
+
+
+def des_sliced(blocks, keys, decrypt=False):
+    """DES on sliced (64, n) block and key rows"""
+    round_keys = keys[KEY_MAP]
+    if decrypt:
+        round_keys = round_keys[::-1]
+    state = blocks[IP_ROWS]
+    L, R = state[:32], state[32:]
+    for K in round_keys:
+        f = sbox_layer(R[E_ROWS] ^ K)[P_ROWS]
+        L, R = R, L ^ f
+    return np.concatenate([R, L])[FP_ROWS]
+
+
+def _crypt(blocks, keys, decrypt):
+    blocks = np.asarray(blocks, dtype=np.uint64).ravel()
+    keys = np.broadcast_to(np.asarray(keys, dtype=np.uint64), blocks.shape)
+    n = len(blocks)
+    # Pad to whole words of 64 lanes
+    padded = -(-n // LANES) * LANES
+    blocks = np.concatenate([blocks, np.zeros(padded - n, dtype=np.uint64)])
+    keys = np.concatenate([keys, np.zeros(padded - n, dtype=np.uint64)])
+    out = des_sliced(to_slices(blocks), to_slices(keys), decrypt)
+    return from_slices(out)[:n]
+
+
+def encrypt_blocks(blocks, keys):
+    """
+    Encrypt blocks[i] under keys[i] for all i (uint64 arrays, or one key
+    for every block), returns the uint64 ciphertexts
+    """
+    return _crypt(blocks, keys, False)
+
+
+def decrypt_blocks(blocks, keys):
+    """Decrypt blocks[i] under keys[i] for all i, returns the uint64 plaintexts"""
+    return _crypt(blocks, keys, True)
+
+
+def check(count=1024, seed=0):
+    """Compare against the scalar engine on random keys and blocks, returns mismatches"""
+    rng = random.Random(seed)
+    keys = [rng.getrandbits(64) for _ in range(count)]
+    blocks = [rng.getrandbits(64) for _ in range(count)]
+    encrypted = encrypt_blocks(np.array(blocks, dtype=np.uint64), np.array(keys, dtype=np.uint64))
+    decrypted = decrypt_blocks(encrypted, np.array(keys, dtype=np.uint64))
+    mismatches = 0
+    for key, block, c, p in zip(keys, blocks, encrypted.tolist(), decrypted.tolist()):
+        if c != encrypt_block(block, key) or decrypt_block(c, key) != block or p != block:
+            mismatches += 1
+    return mismatches
+
+
+def benchmark(count=65536, loop_count=2000, seed=0):
+    """
+    Keys per second of a per-key loop over the scalar engine (each key
+    needs its own schedule) and of one bitsliced batch of count keys.
+    """
+    rng = np.random.default_rng(seed)
+    keys = rng.integers(0, 1 << 64, size=count, dtype=np.uint64, endpoint=False)
+    block = 0x0123456789ABCDEF
+
+    start = time.perf_counter()
+    for key in keys[:loop_count].tolist():
+        encrypt_block(block, key)
+    loop_rate = loop_count / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    encrypt_blocks(np.full(count, block, dtype=np.uint64), keys)
+    sliced_rate = count / (time.perf_counter() - start)
+    return loop_rate, sliced_rate
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bitsliced DES over many keys at once.")
+    parser.add_argument("operation", choices=("check", "benchmark"))
+    parser.add_argument("-n", "--count", type=int, default=65536,
+                        help="instances per batch (default: 65536)")
+    args = parser.parse_args(argv)
+
+    if args.operation == "check":
+        mismatches = check(args.count)
+        print(f"{args.count - mismatches}/{args.count} instances match the scalar engine")
+        parser.exit(1 if mismatches else 0)
+    loop_rate, sliced_rate = benchmark(args.count)
+    print(f"Per-key loop: {loop_rate:,.0f} keys/s")
+    print(f"Bitsliced:    {sliced_rate:,.0f} keys/s ({sliced_rate / loop_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+Known-plaintext DES key search over a reduced key space.
+
+Only the key bits in the unknown mask are searched, the others come from
+a base key. Parity bits are dropped from the mask first: PC-1 ignores
+them, so keys that differ only there are equivalent and one of each
+group is enough.
+
+Candidates are tested with the bitsliced engine, in chunks of
+2**CHUNK_BITS keys. In bitsliced form the key schedule is a fixed row
+selection, so candidates need no schedule of their own: the key rows of
+a chunk are built directly, the low 6 unknown bits as constant lane
+patterns and the higher ones from the chunk and word index. The
+plaintext rows are constants and a match is found by comparing rows, so
+there is no transposition either.
+
+Chunks run on a process pool. Progress is saved to a JSON checkpoint
+file from time to time, so an interrupted search resumes where it
+stopped.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from des import encrypt_block, parse_hex64
+from des_bitslice import ALL_ONES, LANES, des_sliced
+from key_schedule import PARITY_MASK
+
+CHUNK_BITS = 16  # candidates per chunk: 2**16 = 1024 words of 64 lanes
+CHECKPOINT_INTERVAL = 10.0  # seconds between checkpoint writes
+
+# Lane j of a word has bit r of j in the r-th lane pattern
+LANE_PATTERNS = [sum(1 << j for j in range(LANES) if j >> r & 1) for r in range(6)]
+
+
+class KeySpace:
+    """Keys equal to base outside the unknown mask, parity bits excluded"""
+
+    def __init__(self, base, mask):
+        self.mask = mask & ~PARITY_MASK
+        self.base = base & ~mask & ~PARITY_MASK
+        self.skipped_parity = bin(mask & PARITY_MASK).count("1")
+        # Unknown key bits, least significant first: index bit r sets key bit positions[r]
+        self.positions = [v for v in range(64) if self.mask >> v & 1]
+        self.bits = len(self.positions)
+        self.size = 1 << self.bits
+
+    def key_at(self, index):
+        """Candidate key number index"""
+        key = self.base
+        for r, v in enumerate(self.positions):
+            if index >> r & 1:
+                key |= 1 << v
+        return key
+
+    def key_rows(self, start, words):
+        """Sliced key rows for candidates start .. start + 64 * words - 1"""
+        rows = np.empty((64, words), dtype=np.uint64)
+        word_index = np.arange(words, dtype=np.uint64) + np.uint64(start // LANES)
+        rank = {v: r for r, v in enumerate(self.positions)}
+        for row in range(64):
+            v = 63 - row
+            if v not in rank:
+                rows[row] = ALL_ONES if self.base >> v & 1 else 0
+            elif rank[v] < 6:
+                rows[row] = LANE_PATTERNS[rank[v]]
+            else:
+                # 0 or all ones per word: the bit of the word number
+                bit = word_index >> np.uint64(rank[v] - 6) & np.uint64(1)
+                rows[row] = np.uint64(0) - bit
+        return rows
+
+
+def value_rows(value, words):
+    """Sliced rows of one 64-bit value repeated in every lane"""
+    bits = [ALL_ONES if value >> (63 - row) & 1 else 0 for row in range(64)]
+    return np.array(bits, dtype=np.uint64)[:, None].repeat(words, axis=1)
+
+
+def search_chunk(space, plaintext, ciphertext, start, count):
+    """Indices in [start, start + count) whose key encrypts plaintext to ciphertext"""
+    words = -(-count // LANES)
+    out = des_sliced(value_rows(plaintext, words), space.key_rows(start, words))
+    # A lane matches when none of its 64 bits differs from the ciphertext
+    differs = np.bitwise_or.reduce(out ^ value_rows(ciphertext, 1), axis=0)
+    found = []
+    for w in np.flatnonzero(~differs).tolist():
+        lanes = int(~differs[w])
+        for j in range(LANES):
+            index = start + w * LANES + j
+            if lanes >> j & 1 and index < start + count:
+                found.append(index)
+    return found
+
+
+# Worker state, set once per process by _init_worker
+_job = None
+
+
+def _init_worker(base, mask, plaintext, ciphertext):
+    global _job
+    _job = (KeySpace(base, mask), plaintext, ciphertext)
+
+
+def _run_chunk(chunk, chunk_size):
+    space, plaintext, ciphertext = _job
+    start = chunk * chunk_size
+    count = min(chunk_size, space.size - start)
+    return chunk, count, search_chunk(space, plaintext, ciphertext, start, count)
+
+
+def load_checkpoint(path, params):
+    """Completed chunks and found keys of a previous run with the same parameters"""
+    if not path or not os.path.exists(path):
+        return set(), []
+    with open(path) as f:
+        state = json.load(f)
+    if state["params"] != params:
+        raise ValueError(f"Checkpoint {path} belongs to a different search")
+    done = set(range(state["done_below"])) | set(state["done_ahead"])
+    return done, state["found"]
+
+
+def save_checkpoint(path, params, done, found):
+    """Write the checkpoint atomically: completed chunks as a prefix plus stragglers"""
+    done_below = 0
+    while done_below in done:
+        done_below += 1
+    state = {
+        "params": params,
+        "done_below": done_below,
+        "done_ahead": sorted(c for c in done if c > done_below),
+        "found": found
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def print_progress(tested, total, rate, eta):
+    print(f"Keys tested: {tested:,}/{total:,} ({100 * tested / total:.1f}%), "
+          f"{rate:,.0f} keys/s, ETA {format_duration(eta)}")
+
+
+def search(plaintext, ciphertext, base, mask, workers=1, checkpoint=None,
+           stop_on_match=True, chunk_bits=CHUNK_BITS, progress=print_progress,
+           report_every=2.0):
+    """
+    Search the keys equal to base outside mask for the ones that encrypt
+    plaintext to ciphertext. Returns a dict with the found keys (one per
+    parity class), keys tested, elapsed time and rate.
+    """
+    space = KeySpace(base, mask)
+    chunk_size = min(1 << chunk_bits, space.size)
+    chunks = -(-space.size // chunk_size)
+    params = {"plaintext": f"{plaintext:016X}", "ciphertext": f"{ciphertext:016X}",
+              "base": f"{space.base:016X}", "mask": f"{space.mask:016X}",
+              "chunk_size": chunk_size}
+    done, found = load_checkpoint(checkpoint, params)
+    resumed = len(done)
+    pending_chunks = iter([c for c in range(chunks) if c not in done])
+
+    tested = 0
+    remaining = space.size - sum(min(chunk_size, space.size - c * chunk_size) for c in done)
+    started = last_report = last_save = time.perf_counter()
+
+    def collect(chunk, count, indices):
+        nonlocal tested, last_report, last_save
+        done.add(chunk)
+        tested += count
+        for index in indices:
+            key = space.key_at(index)
+            if encrypt_block(plaintext, key) == ciphertext and f"{key:016X}" not in found:
+                found.append(f"{key:016X}")
+        now = time.perf_counter()
+        if progress is not None and now - last_report >= report_every:
+            rate = tested / (now - started)
+            progress(space.size - remaining + tested, space.size, rate,
+                     (remaining - tested) / rate if rate else 0)
+            last_report = now
+        if checkpoint and now - last_save >= CHECKPOINT_INTERVAL:
+            save_checkpoint(checkpoint, params, done, found)
+            last_save = now
+
+    try:
+        if workers <= 1:
+            _init_worker(base, mask, plaintext, ciphertext)
+            for chunk in pending_chunks:
+                collect(*_run_chunk(chunk, chunk_size))
+                if found and stop_on_match:
+                    break
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(base, mask, plaintext, ciphertext)) as pool:
+                # A bounded number of chunks in flight, so huge spaces are not queued up front
+                pending = {pool.submit(_run_chunk, c, chunk_size)
+                           for c in [c for _, c in zip(range(2 * workers), pending_chunks)]}
+                while pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        collect(*future.result())
+                    if found and stop_on_match:
+                        for future in pending:
+                            future.cancel()
+                        break
+                    for _, c in zip(range(len(finished)), pending_chunks):
+                        pending.add(pool.submit(_run_chunk, c, chunk_size))
+    finally:
+        if checkpoint:
+            save_checkpoint(checkpoint, params, done, found)
+
+    elapsed = time.perf_counter() - started
+    return {
+        'keys': found,
+        'bits': space.bits,
+        'skipped_parity_bits': space.skipped_parity,
+        'space': space.size,
+        'tested': tested,
+        'resumed_chunks': resumed,
+        'complete': len(done) == chunks,
+        'elapsed': elapsed,
+        'rate': tested / elapsed if elapsed else 0.0
+    }
+
+
+def low_bits_mask(bits):
+    """Mask of the bits lowest non-parity key bits"""
+    mask, v = 0, 0
+    while bin(mask).count("1") < bits and v < 64:
+        if not PARITY_MASK >> v & 1:
+            mask |= 1 << v
+        v += 1
+    return mask
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Known-plaintext DES key search over the unknown bits of a key.")
+    parser.add_argument("-p", "--plaintext", type=parse_hex64, required=True,
+                        help="64-bit plaintext block in hex")
+    parser.add_argument("-c", "--ciphertext", type=parse_hex64, required=True,
+                        help="64-bit ciphertext block in hex")
+    parser.add_argument("-k", "--key", type=parse_hex64, default=0,
+                        help="known key bits in hex (unknown bits are ignored)")
+    unknown = parser.add_mutually_exclusive_group(required=True)
+    unknown.add_argument("-m", "--mask", type=parse_hex64, help="mask of the unknown key bits in hex")
+    unknown.add_argument("-b", "--bits", type=int, help="the lowest BITS non-parity key bits are unknown")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint", help="checkpoint file, resumed when it exists")
+    parser.add_argument("--all", action="store_true", help="keep searching after the first match")
+    args = parser.parse_args(argv)
+
+    mask = args.mask if args.mask is not None else low_bits_mask(args.bits)
+    space = KeySpace(args.key, mask)
+    print(f"Unknown bits: {space.bits} ({space.size:,} keys)"
+          + (f", {space.skipped_parity} parity bits skipped" if space.skipped_parity else ""))
+    try:
+        result = search(args.plaintext, args.ciphertext, args.key, mask, args.workers,
+                        args.checkpoint, not args.all)
+    except KeyboardInterrupt:
+        parser.exit(130, "\nInterrupted" + (f", progress saved to {args.checkpoint}\n"
+                                             if args.checkpoint else "\n"))
+    except ValueError as e:
+        parser.exit(1, f"Error: {e}\n")
+
+    for key in result['keys']:
+        print(f"Key found: {key}")
+    if not result['keys']:
+        print("No key found" + ("" if result['complete'] else " yet"))
+    print(f"{result['tested']:,} keys in {format_duration(result['elapsed'])}: "
+          f"{result['rate']:,.0f} keys/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,52 @@ def left_shift(bits, n):
     return bits[n:] + bits[:n]
 
 
+def int_to_bits(value, width):
+    """Convert integer to bit string of given width"""
+    return format(value, f'0{width}b')
+
+
+def byte_tables(table, in_bits):
+    """
+    Precompute a permutation table for integers: for every input byte, the
+    output bits it contributes for each of its 256 values.
+
+    Bits are numbered from 1 (most significant) as in the DES tables.
+    Returns one 256-entry lookup per input byte, most significant first.
+    """
+    out_bits = len(table)
+    tables = []
+    for first in range(0, in_bits, 8):
+        # (output bit, bit in the byte) of every table entry reading from this byte
+        sources = [(out_bits - 1 - k, 7 - (src - 1 - first))
+                   for k, src in enumerate(table) if first < src <= first + 8]
+        lookup = []
+        for byte in range(256):
+            out = 0
+            for out_pos, in_pos in sources:
+                if byte >> in_pos & 1:
+                    out |= 1 << out_pos
+            lookup.append(out)
+        tables.append(tuple(lookup))
+    return tuple(tables)
+
+
+def permute_int(value, tables):
+    """Apply permutation to an integer with tables from byte_tables"""
+    out = 0
+    shift = 8 * len(tables)
+    for lookup in tables:
+        shift -= 8
+        out |= lookup[value >> shift & 0xFF]
+    return out
+
+
+def rotate_left(value, n, width=28):
+    """Circular left shift of a width-bit integer"""
+    mask = (1 << width) - 1
+    return (value << n | value >> (width - n)) & mask
+
+
 def generate_random_key():
     """Generate random 64-bit key"""
     return ''.join(random.choice('01') for _ in range(64))
@@ -24,8 +70,8 @@ def generate_random_key():
 
 def apply_pc1(key_64):
     """Apply PC-1 to get K+ (56 bits)"""
-    from des_tables import PC1
-    return permute(key_64, PC1)
+    from key_schedule import pc1
+    return int_to_bits(pc1(int(key_64, 2)), 56)
 
 
 def split_key(key_56):
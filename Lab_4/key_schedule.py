@@ -1,77 +1,173 @@
-from des_tables import PC2, SHIFT_SCHEDULE
-from des_utils import permute, left_shift, split_key, bits_to_hex
+from functools import lru_cache
+from itertools import accumulate, count
 
+from des_tables import PC1, PC2, SHIFT_SCHEDULE
+from des_utils import int_to_bits, byte_tables, rotate_left
+from key_trace import (ConsoleTracer, SplitEvent, ShiftEvent, CombineEvent,
+                       PC2Event)
 
-def generate_round_key(K_plus, round_num, verbose=True):
-    """
-    Generate round key Ki for given round number
+# PC-1/PC-2 as byte-indexed lookup tables for integer keys
+PC1_TABLES = byte_tables(PC1, 64)
+PC2_TABLES = byte_tables(PC2, 56)
+MASK_28 = (1 << 28) - 1
+# Parity bits of a 64-bit key (dropped by PC-1)
+PARITY_MASK = 0x0101010101010101
 
-    Parameters:
-    - K_plus: 56-bit key after PC-1
-    - round_num: round number (1-16)
-    - verbose: if True, print all intermediate steps
+# Total left shift of C and D after rounds 1..i
+CUMULATIVE_SHIFTS = tuple(accumulate(SHIFT_SCHEDULE))
 
-    Returns:
-    - Ki: 48-bit round key
-    """
-    if verbose:
-        print(f"\n{'='*80}")
-        print(f"GENERATING ROUND KEY K{round_num}")
-        print(f"{'='*80}")
+SCHEDULE_CACHE_SIZE = 1024  # full key schedules kept in memory
+BATCH_CHUNK_SIZE = 1 << 14  # keys per vectorized pass, small enough to stay in cache
 
-    # Step 1: Split K+ into C0 and D0
-    if verbose:
-        print(f"\nStep 1: Split K+ into C0 and D0 (28 bits each)")
+# Unpacked so pc1/pc2 index them without a loop
+P1_0, P1_1, P1_2, P1_3, P1_4, P1_5, P1_6, P1_7 = PC1_TABLES
+P2_0, P2_1, P2_2, P2_3, P2_4, P2_5, P2_6 = PC2_TABLES
 
-    C, D = split_key(K_plus)
 
-    if verbose:
-        print(f"C0 = {C} (hex: {bits_to_hex(C)})")
-        print(f"D0 = {D} (hex: {bits_to_hex(D)})")
+def pc1(key):
+    """Apply PC-1 to a 64-bit integer key, returns K+ as a 56-bit integer"""
+    return (P1_0[key >> 56] | P1_1[key >> 48 & 0xFF] | P1_2[key >> 40 & 0xFF]
+            | P1_3[key >> 32 & 0xFF] | P1_4[key >> 24 & 0xFF] | P1_5[key >> 16 & 0xFF]
+            | P1_6[key >> 8 & 0xFF] | P1_7[key & 0xFF])
 
-    # Step 2: Apply shifts for rounds 1 to i
-    if verbose:
-        print(
-            f"\nStep 2: Apply left circular shifts for rounds 1 to {round_num}")
-        print(f"Shift schedule: {SHIFT_SCHEDULE}")
 
-    for r in range(1, round_num + 1):
-        shifts = SHIFT_SCHEDULE[r-1]
-        C = left_shift(C, shifts)
-        D = left_shift(D, shifts)
+def pc2(cd):
+    """Apply PC-2 to a 56-bit integer CiDi, returns the 48-bit round key"""
+    return (P2_0[cd >> 48] | P2_1[cd >> 40 & 0xFF] | P2_2[cd >> 32 & 0xFF]
+            | P2_3[cd >> 24 & 0xFF] | P2_4[cd >> 16 & 0xFF] | P2_5[cd >> 8 & 0xFF]
+            | P2_6[cd & 0xFF])
 
-        if verbose:
-            print(f"  Round {r}: Shift by {shifts}")
-            print(f"         C{r} = {C} (hex: {bits_to_hex(C)})")
-            print(f"         D{r} = {D} (hex: {bits_to_hex(D)})")
 
-    # Step 3: Combine Ci and Di
-    if verbose:
-        print(f"\nStep 3: Combine C{round_num} and D{round_num}")
+def split_halves(k_plus):
+    """Split 56-bit integer K+ into C0 and D0 (28 bits each)"""
+    return k_plus >> 28, k_plus & MASK_28
 
-    CD = C + D
 
-    if verbose:
-        print(f"C{round_num}D{round_num} (56 bits) = {CD}")
-        print(f"Hex: {bits_to_hex(CD)}")
+def round_key_int(k_plus, round_num):
+    """Round key Ki as a 48-bit integer, from K+ as a 56-bit integer"""
+    C, D = split_halves(k_plus)
+    # One rotation by the total shift of rounds 1..i (28 leaves C and D unchanged)
+    shifts = CUMULATIVE_SHIFTS[round_num - 1]
+    C = (C << shifts | C >> (28 - shifts)) & MASK_28
+    D = (D << shifts | D >> (28 - shifts)) & MASK_28
+    return pc2(C << 28 | D)
 
-    # Step 4: Apply PC-2
-    if verbose:
-        print(f"\nStep 4: Apply PC-2 permutation (56 bits -> 48 bits)")
 
-    Ki = permute(CD, PC2)
+def iter_round_keys(k_plus):
+    """Yield K1..K16 as 48-bit integers in one pass, carrying C and D forward"""
+    C, D = split_halves(k_plus)
+    for shifts in SHIFT_SCHEDULE:
+        C = (C << shifts | C >> (28 - shifts)) & MASK_28
+        D = (D << shifts | D >> (28 - shifts)) & MASK_28
+        yield pc2(C << 28 | D)
 
-    if verbose:
-        print(f"K{round_num} (48 bits) = {Ki}")
-        print(f"Hex: {bits_to_hex(Ki)}")
 
+@lru_cache(maxsize=SCHEDULE_CACHE_SIZE)
+def _cached_schedule(key):
+    return tuple(iter_round_keys(pc1(key)))
+
+
+def get_key_schedule(key):
+    """
+    All 16 round keys of a 64-bit integer key, from a bounded LRU cache.
+    Keys that differ only in parity bits share one entry.
+    """
+    return _cached_schedule(key & ~PARITY_MASK)
+
+
+def trace_round_key(k_plus, round_num, tracer):
+    """round_key_int step by step, passing every step to tracer as an event"""
+    C, D = split_halves(k_plus)
+    tracer(SplitEvent(round_num, C, D))
+    for r in range(1, round_num + 1):
+        shifts = SHIFT_SCHEDULE[r-1]
+        C = rotate_left(C, shifts)
+        D = rotate_left(D, shifts)
+        tracer(ShiftEvent(r, shifts, C, D))
+    CD = C << 28 | D
+    tracer(CombineEvent(round_num, CD))
+    Ki = pc2(CD)
+    tracer(PC2Event(round_num, Ki))
     return Ki
 
 
+def generate_round_key(K_plus, round_num, verbose=True, tracer=None):
+    """
+    Generate round key Ki for given round number
+
+    Parameters:
+    - K_plus: 56-bit key after PC-1
+    - round_num: round number (1-16)
+    - verbose: if True and no tracer is given, print all intermediate steps
+    - tracer: callable receiving the intermediate steps as key_trace events
+
+    Returns:
+    - Ki: 48-bit round key
+
+    Without a tracer this is round_key_int, with no step reporting at all.
+    """
+    if tracer is None and verbose:
+        tracer = ConsoleTracer()
+    if tracer is None:
+        return int_to_bits(round_key_int(int(K_plus, 2), round_num), 48)
+    return int_to_bits(trace_round_key(int(K_plus, 2), round_num, tracer), 48)
+
+
 def generate_all_round_keys(K_plus):
     """Generate all 16 round keys from K+"""
-    round_keys = []
-    for i in range(1, 17):
-        Ki = generate_round_key(K_plus, i, verbose=False)
-        round_keys.append(Ki)
-    return round_keys
+    return [int_to_bits(Ki, 48) for Ki in iter_round_keys(int(K_plus, 2))]
+
+
+@lru_cache(maxsize=None)
+def _array_tables():
+    """
+    NumPy lookup tables for the batch schedule: PC1_TABLES, and PC-2 split
+    by 14-bit quarters of CiDi (the high and low halves of Ci and Di), so a
+    round key is 4 lookups
+    """
+    import numpy as np
+    pc1_tables = np.array(PC1_TABLES, dtype=np.uint64)
+    pc2_tables = np.array(PC2_TABLES, dtype=np.uint64)
+    quarter = np.arange(1 << 14, dtype=np.uint64)
+    # PC-2 is linear over OR: each quarter's table is PC-2 of the quarter alone
+    pc2_quarters = tuple(_permute_array(quarter << np.uint64(shift), pc2_tables)
+                         for shift in (42, 28, 14, 0))
+    return pc1_tables, pc2_quarters
+
+
+def _permute_array(values, tables):
+    """permute_int on every element of a uint64 array"""
+    import numpy as np
+    out = tables[0][values >> np.uint64(8 * (len(tables) - 1))]
+    for shift, lookup in zip(count(8 * (len(tables) - 2), -8), tables[1:]):
+        out |= lookup[values >> np.uint64(shift) & np.uint64(0xFF)]
+    return out
+
+
+def generate_all_round_keys_batch(keys):
+    """
+    Round keys of many 64-bit keys at once (requires NumPy).
+    keys is an array-like of uint64 keys; returns an (N, 16) uint64 array
+    whose row i holds K1..K16 of keys[i], as round_key_int would give them.
+    """
+    import numpy as np
+    keys = np.ascontiguousarray(keys, dtype=np.uint64).ravel()
+    pc1_tables, (c_high, c_low, d_high, d_low) = _array_tables()
+    mask, low, half = np.uint64(MASK_28), np.uint64(0x3FFF), np.uint64(14)
+    out = np.empty((len(keys), 16), dtype=np.uint64)
+    for start in range(0, len(keys), BATCH_CHUNK_SIZE):
+        k_plus = _permute_array(keys[start:start + BATCH_CHUNK_SIZE], pc1_tables)
+        C0, D0 = k_plus >> np.uint64(28), k_plus & mask
+        rounds = np.empty((16, len(k_plus)), dtype=np.uint64)
+        for i, shifts in enumerate(CUMULATIVE_SHIFTS):
+            # Rotate C0/D0 by the total shift of rounds 1..i, as in round_key_int
+            left, right = np.uint64(shifts), np.uint64(28 - shifts)
+            C = (C0 << left | C0 >> right) & mask
+            D = (D0 << left | D0 >> right) & mask
+            Ki = c_high[C >> half]
+            Ki |= c_low[C & low]
+            Ki |= d_high[D >> half]
+            Ki |= d_low[D & low]
+            rounds[i] = Ki
+        out[start:start + len(k_plus)] = rounds.T
+    return out
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+Tracing of the DES key schedule.
+
+A tracer is any callable that takes one event. Events are named tuples
+of integers, so callers can inspect C_i/D_i and the round keys directly
+instead of parsing printed text. ConsoleTracer prints the step-by-step
+report of the key schedule, TraceCollector keeps the events in a list.
+"""
+
+from collections import namedtuple
+
+from des_tables import SHIFT_SCHEDULE
+from des_utils import bits_to_hex, int_to_bits
+
+# K+ split into C0 and D0, for round key K{round}
+SplitEvent = namedtuple("SplitEvent", "round C D")
+# Ci and Di after the left shift of round i
+ShiftEvent = namedtuple("ShiftEvent", "round shifts C D")
+# CiDi, the 56-bit concatenation of Ci and Di
+CombineEvent = namedtuple("CombineEvent", "round CD")
+# Ki, the 48-bit result of PC-2
+PC2Event = namedtuple("PC2Event", "round Ki")
+
+
+class TraceCollector:
+    """Tracer that records every event"""
+
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event):
+        self.events.append(event)
+
+    def of_type(self, event_type):
+        """Recorded events of one type, in order"""
+        return [e for e in self.events if isinstance(e, event_type)]
+
+
+class ConsoleTracer:
+    """Tracer that prints every step of the key schedule"""
+
+    def __call__(self, event):
+        getattr(self, f"on_{type(event).__name__}")(event)
+
+    @staticmethod
+    def _half(name, value, indent=""):
+        bits = int_to_bits(value, 28)
+        print(f"{indent}{name} = {bits} (hex: {bits_to_hex(bits)})")
+
+    def on_SplitEvent(self, event):
+        print(f"\n{'='*80}")
+        print(f"GENERATING ROUND KEY K{event.round}")
+        print(f"{'='*80}")
+
+        print(f"\nStep 1: Split K+ into C0 and D0 (28 bits each)")
+        self._half("C0", event.C)
+        self._half("D0", event.D)
+
+        print(f"\nStep 2: Apply left circular shifts for rounds 1 to {event.round}")
+        print(f"Shift schedule: {SHIFT_SCHEDULE}")
+
+    def on_ShiftEvent(self, event):
+        print(f"  Round {event.round}: Shift by {event.shifts}")
+        self._half(f"C{event.round}", event.C, " " * 9)
+        self._half(f"D{event.round}", event.D, " " * 9)
+
+    def on_CombineEvent(self, event):
+        CD = int_to_bits(event.CD, 56)
+        print(f"\nStep 3: Combine C{event.round} and D{event.round}")
+        print(f"C{event.round}D{event.round} (56 bits) = {CD}")
+        print(f"Hex: {bits_to_hex(CD)}")
+
+    def on_PC2Event(self, event):
+        Ki = int_to_bits(event.Ki, 48)
+        print(f"\nStep 4: Apply PC-2 permutation (56 bits -> 48 bits)")
+        print(f"K{event.round} (48 bits) = {Ki}")
+        print(f"Hex: {bits_to_hex(Ki)}")
@@ -2,6 +2,7 @@ from des_tables import PC1, PC2, SHIFT_SCHEDULE
 from des_utils import (print_separator, print_table, bits_to_hex,
                        generate_random_key, apply_pc1)
 from key_schedule import generate_round_key
+from key_trace import ConsoleTracer
 
 
 def display_tables():
@@ -112,7 +113,7 @@ def main():
     print_separator()
     round_num = get_round_number()
 
-    Ki = generate_round_key(K_plus, round_num)
+    Ki = generate_round_key(K_plus, round_num, tracer=ConsoleTracer())
 
     # Final result
     print(f"\n{'='*80}")